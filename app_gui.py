@@ -1,31 +1,95 @@
 #!/usr/bin/env python
 import os
-import glob
 import tempfile
 import shutil
 import threading
-import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from typing import Optional
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, colorchooser
 
-import imageio_ffmpeg as iio_ffmpeg
-
 # Reuse the existing converter
 from convert_to_9x16 import (
     convert_to_9x16,
     convert_to_9x16_ffmpeg,
     convert_to_9x16_ffmpeg_parallel,
+    convert_to_9x16_ffmpeg_multi,
     parse_color,
+    load_whisper_model,
     transcribe_to_srt,
     mux_soft_subtitles,
+    split_segments,
     build_subtitle_force_style,
-    _escape_subtitles_path_for_filter,
+    _ffmpeg_exe,
+    _has_nvenc as _probe_nvenc,
 )
 from tiktok_api import oauth_connect, get_user_info, upload_video
 
 APP_TITLE = "Clippy"
 DEFAULT_WIDTH = 1080
 DEFAULT_HEIGHT = 1920
+SHM_DIR = "/dev/shm"
+# TikTok burn: segments encoded by one FFmpeg process. Every output holds its own
+# encoder (~200 MB at 1080x1920), so keep batches small and run more of them.
+BURN_OUTPUTS_PER_PROCESS = 2
+
+
+@dataclass
+class ConvertJob:
+    """Settings for one conversion, read from the UI on the Tk thread."""
+    src: str
+    dst: str
+    w: int
+    h: int
+    bg_hex: str
+    bg_mode: str
+    blur_sigma: int
+    engine_label: str
+    crf: int
+    parallel: bool
+    seg_sec: int
+    jobs: int
+    tiktok: bool
+    tiktok_min: int
+    auto_subs: bool
+    burn_subs: bool
+    model: str
+    lang: Optional[str]
+    force_style: Optional[str]
+    autopost: bool
+    client_key: str
+
+
+def _mem_available() -> int:
+    """Bytes of RAM available without swapping (MemAvailable), 0 if unknown."""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _scratch_dir(needed_bytes: int):
+    """RAM-backed temp dir when it has room for needed_bytes, else None (system default)."""
+    # tmpfs size is only a cap; the files also have to fit in free memory or the box starts swapping
+    try:
+        if (
+            os.path.isdir(SHM_DIR)
+            and shutil.disk_usage(SHM_DIR).free > 2 * needed_bytes
+            and _mem_available() > 2 * needed_bytes
+        ):
+            return SHM_DIR
+    except OSError:
+        pass
+    return None
 
 
 class App(tk.Tk):
@@ -43,6 +107,12 @@ class App(tk.Tk):
         self.bg_mode_var = tk.StringVar(value="color")  # color | blur
         self.blur_sigma_var = tk.IntVar(value=20)
         self.status_text = tk.StringVar(value="Idle")
+        self._last_status_ts = 0.0
+        # Latest throttled status text not shown yet, and whether a flush is already queued;
+        # both are shared by worker threads and the Tk thread
+        self._status_lock = threading.Lock()
+        self._pending_status = None
+        self._status_flush_queued = False
         self.engine_var = tk.StringVar(value="FFmpeg (auto)")
         self.crf_var = tk.IntVar(value=20)
         self.parallel_var = tk.BooleanVar(value=False)
@@ -69,8 +139,14 @@ class App(tk.Tk):
 
         self._build_ui()
 
+    def _toggle(self, widget):
+        """Register an input widget that is disabled while a job is running."""
+        self._toggle_widgets.append(widget)
+        return widget
+
     def _build_ui(self):
         pad = {'padx': 10, 'pady': 6}
+        self._toggle_widgets = []
 
         container = ttk.Frame(self)
         container.pack(fill=tk.BOTH, expand=True)
@@ -83,8 +159,16 @@ class App(tk.Tk):
         self.body = ttk.Frame(self._canvas)
         body_window = self._canvas.create_window((0, 0), window=self.body, anchor="nw")
 
-        def _on_body_config(_e=None):
+        # Coalesce bursts of <Configure> events into one scrollregion update per idle pass
+        self._pending_config = False
+        def _apply_config():
+            self._pending_config = False
             self._canvas.configure(scrollregion=self._canvas.bbox("all"))
+        def _on_body_config(_e=None):
+            if self._pending_config:
+                return
+            self._pending_config = True
+            self.after_idle(_apply_config)
         def _on_canvas_config(e=None):
             try:
                 self._canvas.itemconfigure(body_window, width=self._canvas.winfo_width())
@@ -96,14 +180,14 @@ class App(tk.Tk):
         # Input
         frm_in = ttk.LabelFrame(self.body, text="Input video")
         frm_in.pack(fill=tk.X, **pad)
-        ttk.Entry(frm_in, textvariable=self.input_path).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 6), pady=8)
-        ttk.Button(frm_in, text="Browse...", command=self.browse_input).pack(side=tk.LEFT, padx=(0, 10), pady=8)
+        self._toggle(ttk.Entry(frm_in, textvariable=self.input_path)).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 6), pady=8)
+        self._toggle(ttk.Button(frm_in, text="Browse...", command=self.browse_input)).pack(side=tk.LEFT, padx=(0, 10), pady=8)
 
         # Output
         frm_out = ttk.LabelFrame(self.body, text="Output file (.mp4)")
         frm_out.pack(fill=tk.X, **pad)
-        ttk.Entry(frm_out, textvariable=self.output_path).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 6), pady=8)
-        ttk.Button(frm_out, text="Save As...", command=self.browse_output).pack(side=tk.LEFT, padx=(0, 10), pady=8)
+        self._toggle(ttk.Entry(frm_out, textvariable=self.output_path)).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 6), pady=8)
+        self._toggle(ttk.Button(frm_out, text="Save As...", command=self.browse_output)).pack(side=tk.LEFT, padx=(0, 10), pady=8)
 
         # Options
         frm_opts = ttk.LabelFrame(self.body, text="Options (9:16)")
@@ -116,7 +200,7 @@ class App(tk.Tk):
             ("540 x 960 (qHD)", 540, 960),
         ]
         ttk.Label(frm_opts, text="Preset:").grid(row=0, column=0, sticky=tk.W, padx=(10, 6), pady=(10, 4))
-        self.preset_cb = ttk.Combobox(frm_opts, state="readonly", values=[p[0] for p in presets])
+        self.preset_cb = self._toggle(ttk.Combobox(frm_opts, state="readonly", values=[p[0] for p in presets]))
         self.preset_cb.grid(row=0, column=1, sticky=tk.W, pady=(10, 4))
         self.preset_cb.current(0)
 
@@ -130,49 +214,39 @@ class App(tk.Tk):
 
         # Size
         ttk.Label(frm_opts, text="Width:").grid(row=1, column=0, sticky=tk.W, padx=(10, 6))
-        ttk.Spinbox(frm_opts, from_=240, to=2160, increment=10, textvariable=self.width_var, width=10).grid(row=1, column=1, sticky=tk.W)
+        self._toggle(ttk.Spinbox(frm_opts, from_=240, to=2160, increment=10, textvariable=self.width_var, width=10)).grid(row=1, column=1, sticky=tk.W)
         ttk.Label(frm_opts, text="Height:").grid(row=1, column=2, sticky=tk.W, padx=(10, 6))
-        ttk.Spinbox(frm_opts, from_=426, to=3840, increment=10, textvariable=self.height_var, width=10).grid(row=1, column=3, sticky=tk.W)
+        self._toggle(ttk.Spinbox(frm_opts, from_=426, to=3840, increment=10, textvariable=self.height_var, width=10)).grid(row=1, column=3, sticky=tk.W)
 
         # Background options
         ttk.Label(frm_opts, text="Background:").grid(row=2, column=0, sticky=tk.W, padx=(10, 6), pady=(6, 2))
-        self.bg_mode_cb = ttk.Combobox(
+        self.bg_mode_cb = self._toggle(ttk.Combobox(
             frm_opts,
             state="readonly",
             textvariable=self.bg_mode_var,
             values=["color", "blur"],
             width=10,
-        )
+        ))
         self.bg_mode_cb.grid(row=2, column=1, sticky=tk.W, pady=(6, 2))
         self.bg_mode_cb.current(0)
 
         # Color controls (visible for color mode)
         self.color_preview = tk.Label(frm_opts, textvariable=self.bg_hex, width=12, relief=tk.SUNKEN, bg=self.bg_hex.get(), fg="#ffffff")
         self.color_preview.grid(row=2, column=2, sticky=tk.W, pady=(6, 2))
-        self.pick_color_btn = ttk.Button(frm_opts, text="Pick...", command=self.pick_color)
+        self.pick_color_btn = self._toggle(ttk.Button(frm_opts, text="Pick...", command=self.pick_color))
         self.pick_color_btn.grid(row=2, column=3, sticky=tk.W, pady=(6, 2))
 
         # Blur controls (visible for blur mode)
         ttk.Label(frm_opts, text="Blur sigma:").grid(row=3, column=0, sticky=tk.W, padx=(10, 6))
-        self.blur_spin = ttk.Spinbox(frm_opts, from_=1, to=100, increment=1, textvariable=self.blur_sigma_var, width=10)
+        self.blur_spin = self._toggle(ttk.Spinbox(frm_opts, from_=1, to=100, increment=1, textvariable=self.blur_sigma_var, width=10))
         self.blur_spin.grid(row=3, column=1, sticky=tk.W)
 
-        def on_bg_mode(_=None):
-            mode = self.bg_mode_var.get()
-            is_color = (mode == "color")
-            # Enable/disable color widgets
-            state_color = tk.NORMAL if is_color else tk.DISABLED
-            self.color_preview.configure(state=state_color)
-            self.pick_color_btn.configure(state=state_color)
-            # Enable/disable blur widgets
-            state_blur = tk.NORMAL if not is_color else tk.DISABLED
-            self.blur_spin.configure(state=state_blur)
-        self.bg_mode_cb.bind("<<ComboboxSelected>>", on_bg_mode)
-        on_bg_mode()
+        self.bg_mode_cb.bind("<<ComboboxSelected>>", self._on_bg_mode)
+        self._on_bg_mode()
 
         # Engine / Speed
         ttk.Label(frm_opts, text="Engine:").grid(row=4, column=0, sticky=tk.W, padx=(10, 6))
-        self.engine_cb = ttk.Combobox(
+        self.engine_cb = self._toggle(ttk.Combobox(
             frm_opts,
             state="readonly",
             textvariable=self.engine_var,
@@ -180,99 +254,99 @@ class App(tk.Tk):
                 "FFmpeg (auto)",
                 "FFmpeg (CPU)",
                 "FFmpeg (NVIDIA)",
-                "MoviePy",
+                "MoviePy (legacy)",
             ],
             width=18,
-        )
+        ))
         self.engine_cb.grid(row=4, column=1, sticky=tk.W)
 
         ttk.Label(frm_opts, text="CRF (CPU):").grid(row=4, column=2, sticky=tk.W, padx=(10, 6))
-        ttk.Spinbox(frm_opts, from_=14, to=30, increment=1, textvariable=self.crf_var, width=6).grid(row=4, column=3, sticky=tk.W)
+        self._toggle(ttk.Spinbox(frm_opts, from_=14, to=30, increment=1, textvariable=self.crf_var, width=6)).grid(row=4, column=3, sticky=tk.W)
 
         # Parallel chunk options
-        self.parallel_chk = ttk.Checkbutton(frm_opts, text="Parallel chunks", variable=self.parallel_var)
+        self.parallel_chk = self._toggle(ttk.Checkbutton(frm_opts, text="Parallel chunks", variable=self.parallel_var))
         self.parallel_chk.grid(row=5, column=0, sticky=tk.W, padx=(10, 6), pady=(6, 10))
         ttk.Label(frm_opts, text="Segment (s):").grid(row=5, column=1, sticky=tk.W, padx=(10, 6), pady=(6, 10))
-        ttk.Spinbox(frm_opts, from_=5, to=300, increment=5, textvariable=self.seg_var, width=8).grid(row=5, column=1, sticky=tk.E, pady=(6, 10))
+        self._toggle(ttk.Spinbox(frm_opts, from_=5, to=300, increment=5, textvariable=self.seg_var, width=8)).grid(row=5, column=1, sticky=tk.E, pady=(6, 10))
         ttk.Label(frm_opts, text="Jobs:").grid(row=5, column=2, sticky=tk.W, padx=(10, 6), pady=(6, 10))
-        ttk.Spinbox(frm_opts, from_=1, to=8, increment=1, textvariable=self.jobs_var, width=6).grid(row=5, column=3, sticky=tk.W, pady=(6, 10))
+        self._toggle(ttk.Spinbox(frm_opts, from_=1, to=8, increment=1, textvariable=self.jobs_var, width=6)).grid(row=5, column=3, sticky=tk.W, pady=(6, 10))
 
         # Subtitles
         frm_subs = ttk.LabelFrame(self.body, text="Subtitles")
         frm_subs.pack(fill=tk.X, **pad)
-        self.auto_chk = ttk.Checkbutton(frm_subs, text="Auto subtitles (generate .srt)", variable=self.auto_subs_var)
+        self.auto_chk = self._toggle(ttk.Checkbutton(frm_subs, text="Auto subtitles (generate .srt)", variable=self.auto_subs_var))
         self.auto_chk.grid(row=0, column=0, sticky=tk.W, padx=(10, 6), pady=(8, 4))
-        self.burn_chk = ttk.Checkbutton(frm_subs, text="Burn into video (not removable)", variable=self.burn_subs_var)
+        self.burn_chk = self._toggle(ttk.Checkbutton(frm_subs, text="Burn into video (not removable)", variable=self.burn_subs_var))
         self.burn_chk.grid(row=0, column=1, sticky=tk.W, padx=(10, 6), pady=(8, 4))
 
         ttk.Label(frm_subs, text="Model:").grid(row=1, column=0, sticky=tk.W, padx=(10, 6), pady=(0, 10))
-        self.model_cb = ttk.Combobox(
+        self.model_cb = self._toggle(ttk.Combobox(
             frm_subs,
             state="readonly",
             textvariable=self.subs_model_var,
             values=["tiny", "base", "small", "medium", "large-v3"],
             width=12,
-        )
+        ))
         self.model_cb.grid(row=1, column=1, sticky=tk.W, pady=(0, 10))
         self.model_cb.current(1)
 
         ttk.Label(frm_subs, text="Language (opt):").grid(row=1, column=2, sticky=tk.W, padx=(10, 6), pady=(0, 10))
-        ttk.Entry(frm_subs, textvariable=self.subs_lang_var, width=10).grid(row=1, column=3, sticky=tk.W, pady=(0, 10))
+        self._toggle(ttk.Entry(frm_subs, textvariable=self.subs_lang_var, width=10)).grid(row=1, column=3, sticky=tk.W, pady=(0, 10))
 
         # Style controls (apply when Burn-in enabled)
         ttk.Label(frm_subs, text="Font:").grid(row=2, column=0, sticky=tk.W, padx=(10, 6))
-        ttk.Entry(frm_subs, textvariable=self.subs_font_var, width=14).grid(row=2, column=1, sticky=tk.W)
+        self._toggle(ttk.Entry(frm_subs, textvariable=self.subs_font_var, width=14)).grid(row=2, column=1, sticky=tk.W)
         ttk.Label(frm_subs, text="Size:").grid(row=2, column=2, sticky=tk.W, padx=(10, 6))
-        ttk.Spinbox(frm_subs, from_=10, to=96, increment=1, textvariable=self.subs_size_var, width=6).grid(row=2, column=3, sticky=tk.W)
+        self._toggle(ttk.Spinbox(frm_subs, from_=10, to=96, increment=1, textvariable=self.subs_size_var, width=6)).grid(row=2, column=3, sticky=tk.W)
 
         # Colors
         ttk.Label(frm_subs, text="Text color:").grid(row=3, column=0, sticky=tk.W, padx=(10, 6), pady=(4, 0))
         self.subs_color_preview = tk.Label(frm_subs, textvariable=self.subs_color_hex, width=10, relief=tk.SUNKEN, bg=self.subs_color_hex.get())
         self.subs_color_preview.grid(row=3, column=1, sticky=tk.W, pady=(4, 0))
-        ttk.Button(frm_subs, text="Pick", command=self.pick_subs_color).grid(row=3, column=1, sticky=tk.E, pady=(4, 0))
+        self._toggle(ttk.Button(frm_subs, text="Pick", command=self.pick_subs_color)).grid(row=3, column=1, sticky=tk.E, pady=(4, 0))
 
         ttk.Label(frm_subs, text="Outline color:").grid(row=3, column=2, sticky=tk.W, padx=(10, 6), pady=(4, 0))
         self.subs_outline_preview = tk.Label(frm_subs, textvariable=self.subs_outline_hex, width=10, relief=tk.SUNKEN, bg=self.subs_outline_hex.get())
         self.subs_outline_preview.grid(row=3, column=3, sticky=tk.W, pady=(4, 0))
-        ttk.Button(frm_subs, text="Pick", command=self.pick_subs_outline_color).grid(row=3, column=3, sticky=tk.E, pady=(4, 0))
+        self._toggle(ttk.Button(frm_subs, text="Pick", command=self.pick_subs_outline_color)).grid(row=3, column=3, sticky=tk.E, pady=(4, 0))
 
         # Outline / Shadow
         ttk.Label(frm_subs, text="Outline:").grid(row=4, column=0, sticky=tk.W, padx=(10, 6))
-        ttk.Spinbox(frm_subs, from_=0, to=10, increment=1, textvariable=self.subs_outline_var, width=6).grid(row=4, column=1, sticky=tk.W)
+        self._toggle(ttk.Spinbox(frm_subs, from_=0, to=10, increment=1, textvariable=self.subs_outline_var, width=6)).grid(row=4, column=1, sticky=tk.W)
         ttk.Label(frm_subs, text="Shadow:").grid(row=4, column=2, sticky=tk.W, padx=(10, 6))
-        ttk.Spinbox(frm_subs, from_=0, to=10, increment=1, textvariable=self.subs_shadow_var, width=6).grid(row=4, column=3, sticky=tk.W)
+        self._toggle(ttk.Spinbox(frm_subs, from_=0, to=10, increment=1, textvariable=self.subs_shadow_var, width=6)).grid(row=4, column=3, sticky=tk.W)
 
         # Alignment / Margin / Box
         ttk.Label(frm_subs, text="Align:").grid(row=5, column=0, sticky=tk.W, padx=(10, 6), pady=(0, 10))
-        ttk.Combobox(frm_subs, state="readonly", values=["bottom", "middle", "top"], textvariable=self.subs_align_var, width=10).grid(row=5, column=1, sticky=tk.W, pady=(0, 10))
+        self._toggle(ttk.Combobox(frm_subs, state="readonly", values=["bottom", "middle", "top"], textvariable=self.subs_align_var, width=10)).grid(row=5, column=1, sticky=tk.W, pady=(0, 10))
         ttk.Label(frm_subs, text="MarginV:").grid(row=5, column=2, sticky=tk.W, padx=(10, 6), pady=(0, 10))
-        ttk.Spinbox(frm_subs, from_=0, to=200, increment=2, textvariable=self.subs_margin_var, width=6).grid(row=5, column=3, sticky=tk.W, pady=(0, 10))
-        ttk.Checkbutton(frm_subs, text="Box background", variable=self.subs_box_bg_var).grid(row=5, column=4, sticky=tk.W, padx=(10, 0), pady=(0, 10))
+        self._toggle(ttk.Spinbox(frm_subs, from_=0, to=200, increment=2, textvariable=self.subs_margin_var, width=6)).grid(row=5, column=3, sticky=tk.W, pady=(0, 10))
+        self._toggle(ttk.Checkbutton(frm_subs, text="Box background", variable=self.subs_box_bg_var)).grid(row=5, column=4, sticky=tk.W, padx=(10, 0), pady=(0, 10))
 
         # TikTok mode
         frm_tt = ttk.LabelFrame(self.body, text="TikTok")
         frm_tt.pack(fill=tk.X, **pad)
-        self.tiktok_chk = ttk.Checkbutton(frm_tt, text="Enable TikTok mode", variable=self.tiktok_var)
+        self.tiktok_chk = self._toggle(ttk.Checkbutton(frm_tt, text="Enable TikTok mode", variable=self.tiktok_var))
         self.tiktok_chk.grid(row=0, column=0, sticky=tk.W, padx=(10, 6), pady=(8, 4))
         ttk.Label(frm_tt, text="Segment length (min):").grid(row=0, column=1, sticky=tk.W, padx=(10, 6))
-        ttk.Spinbox(frm_tt, from_=1, to=30, increment=1, textvariable=self.tiktok_min_var, width=6).grid(row=0, column=2, sticky=tk.W)
+        self._toggle(ttk.Spinbox(frm_tt, from_=1, to=30, increment=1, textvariable=self.tiktok_min_var, width=6)).grid(row=0, column=2, sticky=tk.W)
         # TikTok connect + client key
         ttk.Label(frm_tt, text="Client key:").grid(row=1, column=0, sticky=tk.W, padx=(10, 6))
         self.tt_client_key = tk.StringVar()
-        ttk.Entry(frm_tt, textvariable=self.tt_client_key, width=28).grid(row=1, column=1, sticky=tk.W)
+        self._toggle(ttk.Entry(frm_tt, textvariable=self.tt_client_key, width=28)).grid(row=1, column=1, sticky=tk.W)
         self.tt_connected_lbl = ttk.Label(frm_tt, text="Not connected")
         self.tt_connected_lbl.grid(row=1, column=2, sticky=tk.W)
-        ttk.Button(frm_tt, text="Connect TikTok", command=self.connect_tiktok).grid(row=1, column=3, sticky=tk.W, padx=(6, 0))
+        self._toggle(ttk.Button(frm_tt, text="Connect TikTok", command=self.connect_tiktok)).grid(row=1, column=3, sticky=tk.W, padx=(6, 0))
         self.tt_autopost = tk.BooleanVar(value=False)
-        ttk.Checkbutton(frm_tt, text="Auto-post segments", variable=self.tt_autopost).grid(row=2, column=0, columnspan=2, sticky=tk.W, padx=(10, 6), pady=(0, 6))
+        self._toggle(ttk.Checkbutton(frm_tt, text="Auto-post segments", variable=self.tt_autopost)).grid(row=2, column=0, columnspan=2, sticky=tk.W, padx=(10, 6), pady=(0, 6))
 
         # Action row
         frm_act = ttk.Frame(self.body)
         frm_act.pack(fill=tk.X, **pad)
-        self.convert_btn = ttk.Button(frm_act, text="Convert", command=self.start_convert)
+        self.convert_btn = self._toggle(ttk.Button(frm_act, text="Convert", command=self.start_convert))
         self.convert_btn.pack(side=tk.LEFT, padx=(10, 6))
 
-        self.fastest_btn = ttk.Button(frm_act, text="Fastest (Auto)", command=self.fastest_convert)
+        self.fastest_btn = self._toggle(ttk.Button(frm_act, text="Fastest (Auto)", command=self.fastest_convert))
         self.fastest_btn.pack(side=tk.LEFT, padx=(0, 6))
 
         self.progress = ttk.Progressbar(frm_act, mode="indeterminate")
@@ -369,22 +443,55 @@ class App(tk.Tk):
         except Exception as e:
             messagebox.showerror("Color Picker", f"Failed to pick outline color: {e}")
 
+    def _on_bg_mode(self, _=None):
+        mode = self.bg_mode_var.get()
+        is_color = (mode == "color")
+        # Enable/disable color widgets
+        state_color = tk.NORMAL if is_color else tk.DISABLED
+        self.color_preview.configure(state=state_color)
+        self.pick_color_btn.configure(state=state_color)
+        # Enable/disable blur widgets
+        state_blur = tk.NORMAL if not is_color else tk.DISABLED
+        self.blur_spin.configure(state=state_blur)
+
     def _set_busy(self, busy: bool):
-        state = tk.DISABLED if busy else tk.NORMAL
-        for child in self.winfo_children():
-            try:
-                child.configure(state=state)
-            except tk.TclError:
-                pass
-        # Re-enable status label even when disabled loop above
-        self.status_lbl.configure(state=tk.NORMAL)
-        self.convert_btn.configure(state=tk.DISABLED if busy else tk.NORMAL)
+        # ttk state flags keep "readonly" comboboxes readonly when re-enabled
+        flags = ["disabled"] if busy else ["!disabled"]
+        for w in self._toggle_widgets:
+            w.state(flags)
+        if not busy:
+            # Restore the color/blur controls that depend on the background mode
+            self._on_bg_mode()
         if busy:
             self.progress.start(10)
         else:
             self.progress.stop()
 
-    def start_convert(self):
+    def _set_status(self, text: str):
+        """
+        Post a status update from a worker thread, at most one per 100 ms. A throttled
+        message is not lost: the latest one is shown when the interval is up.
+        """
+        with self._status_lock:
+            self._pending_status = text
+            if self._status_flush_queued:
+                return
+            now = time.monotonic()
+            wait = max(0.0, 0.1 - (now - self._last_status_ts))
+            self._status_flush_queued = True
+            self._last_status_ts = now + wait
+        self.after(int(wait * 1000) + 1 if wait else 0, self._flush_status)
+
+    def _flush_status(self):
+        # Tk thread: show whatever _set_status posted last
+        with self._status_lock:
+            text, self._pending_status = self._pending_status, None
+            self._status_flush_queued = False
+        if text is not None:
+            self.status_text.set(text)
+
+    def start_convert(self, overrides: Optional[dict] = None):
+        """Start a conversion; overrides (ConvertJob field -> value) take precedence over the UI."""
         src = self.input_path.get().strip()
         dst = self.output_path.get().strip()
         if not src or not os.path.isfile(src):
@@ -407,8 +514,38 @@ class App(tk.Tk):
             messagebox.showwarning("Dimensions", "Please enter valid positive width and height.")
             return
 
-        hx = self.bg_hex.get() or "#000000"
-        engine_label = self.engine_var.get()
+        # Snapshot every setting here on the Tk thread; the worker only reads `job`
+        try:
+            job = ConvertJob(
+                src=src,
+                dst=dst,
+                w=w,
+                h=h,
+                bg_hex=self.bg_hex.get() or "#000000",
+                bg_mode=self.bg_mode_var.get(),
+                blur_sigma=int(self.blur_sigma_var.get()),
+                engine_label=self.engine_var.get(),
+                crf=int(self.crf_var.get()),
+                parallel=bool(self.parallel_var.get()),
+                seg_sec=int(self.seg_var.get()),
+                jobs=int(self.jobs_var.get()),
+                tiktok=bool(self.tiktok_var.get()),
+                tiktok_min=max(1, int(self.tiktok_min_var.get() or 1)),
+                auto_subs=bool(self.auto_subs_var.get()),
+                burn_subs=bool(self.burn_subs_var.get()),
+                model=self.subs_model_var.get(),
+                lang=self.subs_lang_var.get().strip() or None,
+                force_style=self._subtitle_force_style() if self.burn_subs_var.get() else None,
+                autopost=bool(self.tt_autopost.get()),
+                client_key=(self.tt_client_key.get() or "").strip(),
+            )
+        except (tk.TclError, ValueError):
+            messagebox.showwarning("Settings", "Please enter valid numbers for blur, CRF, segment length, jobs and TikTok minutes.")
+            return
+        if overrides:
+            job = replace(job, **overrides)
+
+        engine_label = job.engine_label
         if engine_label == "FFmpeg (auto)":
             engine = "ffmpeg"; encoder = "auto"
         elif engine_label == "FFmpeg (CPU)":
@@ -416,9 +553,10 @@ class App(tk.Tk):
         elif engine_label == "FFmpeg (NVIDIA)":
             engine = "ffmpeg"; encoder = "nvidia"
         else:
-            engine = "moviepy"; encoder = "cpu"
-        bg_mode = self.bg_mode_var.get()
-        blur_sigma = int(self.blur_sigma_var.get())
+            # MoviePy is kept only for debugging; libx264 gives the same result far faster
+            engine = "moviepy" if os.getenv("CLIPPY_FORCE_MOVIEPY") else "ffmpeg"; encoder = "cpu"
+        bg_mode = job.bg_mode
+        blur_sigma = job.blur_sigma
 
         def worker():
             self.after(0, lambda: (self._set_busy(True), self.status_text.set("Converting...")))
@@ -426,228 +564,183 @@ class App(tk.Tk):
             err = None
             done_msg = None
             try:
-                rgb = parse_color(hx)
+                rgb = parse_color(job.bg_hex)
                 # Work on local copies to avoid scope issues
                 engine_local = engine
                 encoder_local = encoder
                 # If user selected MoviePy but needs blurred background, switch to FFmpeg
                 if engine_local != "ffmpeg" and bg_mode == "blur":
-                    self.after(0, lambda: self.status_text.set("Using FFmpeg for blurred background..."))
+                    self._set_status("Using FFmpeg for blurred background...")
                     engine_local = "ffmpeg"
                     if encoder_local == "cpu":
                         encoder_local = "auto"
                 # Subtitles: optionally transcribe first (skip in TikTok mode; handled per-segment later)
-                tiktok_mode = bool(self.tiktok_var.get())
+                tiktok_mode = job.tiktok
+                # TikTok segments are cut with stream copy, so key frames must sit on segment boundaries
+                seg_seconds = job.tiktok_min * 60 if tiktok_mode else None
+                # Style is identical for every burn pass (single file or each TikTok segment)
+                force_style = job.force_style
+                # TikTok + burn-in re-encodes every segment anyway: split the source and do
+                # scale/pad/subtitles in that one encode instead of exporting the full video first
+                tiktok_burn = tiktok_mode and job.burn_subs
                 srt_path = None
-                if self.auto_subs_var.get() and not tiktok_mode:
-                    self.after(0, lambda: self.status_text.set("Transcribing (first run downloads the model)..."))
+                if job.auto_subs and not tiktok_mode:
+                    self._set_status("Transcribing (first run downloads the model)...")
                     root_out = os.path.splitext(dst)[0]
                     srt_path = root_out + ".srt"
-                    lang = self.subs_lang_var.get().strip() or None
-                    transcribe_to_srt(src, srt_path, model_size=self.subs_model_var.get(), language=lang)
-
-                # Convert and embed subtitles
-                if engine_local == "ffmpeg":
-                    if srt_path and self.burn_subs_var.get() and not tiktok_mode:
-                        # Burn-in requires a single pass (disable chunking)
-                        force_style = build_subtitle_force_style(
-                            font_name=self.subs_font_var.get().strip() or "Arial",
-                            font_size=int(self.subs_size_var.get()),
-                            primary_hex=self.subs_color_hex.get().strip() or "#FFFFFF",
-                            outline_hex=self.subs_outline_hex.get().strip() or "#000000",
-                            border_style=3 if self.subs_box_bg_var.get() else 1,
-                            outline=int(self.subs_outline_var.get()),
-                            shadow=int(self.subs_shadow_var.get()),
-                            alignment=self.subs_align_var.get(),
-                            margin_v=int(self.subs_margin_var.get()),
+                    model = load_whisper_model(job.model)
+                    transcribe_to_srt(src, srt_path, model=model, language=job.lang)
+
+                # Convert and embed subtitles. With soft subtitles the encode goes to an
+                # intermediate file that the mux pass turns into the final dst.
+                soft_subs = bool(srt_path) and not job.burn_subs and not tiktok_mode
+                encode_dst = dst + ".nosubs.mp4" if soft_subs else dst
+                if engine_local == "ffmpeg" and not tiktok_burn:
+                    # Burn-in rides along in the same encode (subtitles filter after the pad)
+                    burn_srt = srt_path if job.burn_subs and not tiktok_mode else None
+                    if job.parallel:
+                        convert_to_9x16_ffmpeg_parallel(
+                            src,
+                            encode_dst,
+                            w,
+                            h,
+                            rgb,
+                            encoder=encoder_local,
+                            crf=job.crf,
+                            segment_sec=job.seg_sec,
+                            jobs=job.jobs,
+                            subtitles_path=burn_srt,
+                            force_style=force_style,
+                            bg_mode=bg_mode,
+                            blur_sigma=blur_sigma,
+                            keyframe_interval=seg_seconds,
+                            faststart=not soft_subs,
                         )
+                    else:
                         convert_to_9x16_ffmpeg(
                             src,
-                            dst,
+                            encode_dst,
                             w,
                             h,
                             rgb,
                             encoder=encoder_local,
-                            crf=int(self.crf_var.get()),
-                            subtitles_path=srt_path,
+                            crf=job.crf,
+                            subtitles_path=burn_srt,
                             force_style=force_style,
                             bg_mode=bg_mode,
                             blur_sigma=blur_sigma,
+                            keyframe_interval=seg_seconds,
+                            faststart=not soft_subs,
                         )
-                    else:
-                        # Normal convert (optionally parallel)
-                        if self.parallel_var.get():
-                            convert_to_9x16_ffmpeg_parallel(
-                                src,
-                                dst,
-                                w,
-                                h,
-                                rgb,
-                                encoder=encoder_local,
-                                crf=int(self.crf_var.get()),
-                                segment_sec=int(self.seg_var.get()),
-                                jobs=int(self.jobs_var.get()),
-                                bg_mode=bg_mode,
-                                blur_sigma=blur_sigma,
-                            )
-                        else:
-                            convert_to_9x16_ffmpeg(
-                                src,
-                                dst,
-                                w,
-                                h,
-                                rgb,
-                                encoder=encoder_local,
-                                crf=int(self.crf_var.get()),
-                                bg_mode=bg_mode,
-                                blur_sigma=blur_sigma,
-                            )
-
-                        # Soft-mux subtitles after conversion (skip in TikTok mode)
-                        if srt_path and not self.burn_subs_var.get() and not tiktok_mode:
-                            tmp = dst + ".tmp.mp4"
-                            try:
-                                os.replace(dst, tmp)
-                                lang = self.subs_lang_var.get().strip() or None
-                                mux_soft_subtitles(tmp, srt_path, dst, language=lang)
-                            finally:
-                                try:
-                                    os.remove(tmp)
-                                except OSError:
-                                    pass
-                else:
+                elif not tiktok_burn:
                     # MoviePy path (no burn capability here); convert then (optionally) soft-mux
                     # MoviePy path supports only color background
                     if bg_mode == "blur":
                         raise RuntimeError("Blurred background requires FFmpeg engine.")
-                    convert_to_9x16(src, dst, w, h, rgb)
-                    if srt_path and not self.burn_subs_var.get() and not tiktok_mode:
-                        tmp = dst + ".tmp.mp4"
+                    convert_to_9x16(src, encode_dst, w, h, rgb, force_moviepy=True)
+
+                # Soft-mux subtitles after conversion (skip in TikTok mode)
+                if soft_subs:
+                    try:
+                        mux_soft_subtitles(encode_dst, srt_path, dst, language=job.lang)
+                    finally:
                         try:
-                            os.replace(dst, tmp)
-                            lang = self.subs_lang_var.get().strip() or None
-                            mux_soft_subtitles(tmp, srt_path, dst, language=lang)
-                        finally:
-                            try:
-                                os.remove(tmp)
-                            except OSError:
-                                pass
+                            os.remove(encode_dst)
+                        except OSError:
+                            pass
 
-                # TikTok mode: split exported 9:16, then subtitle per segment
+                # TikTok mode: split (exported 9:16, or the source when burning), then subtitle per segment
                 if tiktok_mode:
-                    self.after(0, lambda: self.status_text.set("TikTok: splitting into segments..."))
-                    ffmpeg = iio_ffmpeg.get_ffmpeg_exe()
-                    seg_minutes = max(1, int(self.tiktok_min_var.get() or 1))
-                    seg_seconds = seg_minutes * 60
-                    tmpdir = tempfile.mkdtemp(prefix="ttkseg_")
+                    self._set_status("TikTok: splitting into segments...")
+                    split_src = src if tiktok_burn else dst
+                    # Segments are written once and read back by every later pass; keep them in RAM when possible
+                    tmpdir = tempfile.mkdtemp(prefix="ttkseg_", dir=_scratch_dir(os.path.getsize(split_src)))
                     try:
-                        seg_pattern = os.path.join(tmpdir, "seg_%03d.mp4")
-                        cmd = [
-                            ffmpeg,
-                            "-hide_banner",
-                            "-y",
-                            "-i",
-                            dst,
-                            "-c",
-                            "copy",
-                            "-map",
-                            "0",
-                            "-f",
-                            "segment",
-                            "-segment_time",
-                            str(seg_seconds),
-                            "-reset_timestamps",
-                            "1",
-                            seg_pattern,
-                        ]
-                        proc = subprocess.run(
-                            cmd,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True,
-                            encoding="utf-8",
-                            errors="replace",
+                        # The source is split as is (any codec) when burning; the 9:16 export was
+                        # encoded with key frames on the segment boundaries
+                        seg_files = split_segments(
+                            split_src,
+                            tmpdir,
+                            seg_seconds,
+                            video_audio_only=tiktok_burn,
+                            keyframe_aligned=not tiktok_burn,
                         )
-                        if proc.returncode != 0:
-                            raise RuntimeError(f"FFmpeg segment failed: {proc.stderr}")
-
-                        seg_files = sorted(glob.glob(os.path.join(tmpdir, "seg_*.mp4")))
-                        if not seg_files:
-                            raise RuntimeError("No segments were produced")
 
                         base_dir = os.path.dirname(dst) or "."
                         base_root = os.path.splitext(os.path.basename(src))[0]
-                        lang = self.subs_lang_var.get().strip() or None
-                        outputs = []
+                        lang = job.lang
+                        burn = job.burn_subs
                         total = len(seg_files)
-
-                        for i, seg in enumerate(seg_files, start=1):
-                            self.after(0, lambda i=i, total=total: self.status_text.set(f"TikTok: subtitles {i}/{total}"))
-                            srt_seg = os.path.join(tmpdir, f"seg_{i:03d}.srt")
-                            transcribe_to_srt(seg, srt_seg, model_size=self.subs_model_var.get(), language=lang)
-
-                            final_out = os.path.join(base_dir, f"{base_root}_tiktok_{i}.mp4")
-                            if self.burn_subs_var.get():
-                                force_style = build_subtitle_force_style(
-                                    font_name=self.subs_font_var.get().strip() or "Arial",
-                                    font_size=int(self.subs_size_var.get()),
-                                    primary_hex=self.subs_color_hex.get().strip() or "#FFFFFF",
-                                    outline_hex=self.subs_outline_hex.get().strip() or "#000000",
-                                    border_style=3 if self.subs_box_bg_var.get() else 1,
-                                    outline=int(self.subs_outline_var.get()),
-                                    shadow=int(self.subs_shadow_var.get()),
-                                    alignment=self.subs_align_var.get(),
-                                    margin_v=int(self.subs_margin_var.get()),
+                        outputs = [os.path.join(base_dir, f"{base_root}_tiktok_{i}.mp4") for i in range(1, total + 1)]
+
+                        # Burn small batches of segments (one output each) on a pool of up to
+                        # `jobs` FFmpeg processes. Consumer GPUs allow only a few NVENC sessions,
+                        # so with NVENC each process gets one segment and at most two run at once.
+                        jobs = max(1, min(job.jobs, total))
+                        workers = jobs
+                        per_process = BURN_OUTPUTS_PER_PROCESS
+                        if burn and (encoder == "nvidia" or (encoder == "auto" and self._has_nvenc())):
+                            workers = min(workers, 2)
+                            per_process = 1
+                        workers = max(1, min(workers, -(-total // per_process)))
+
+                        # Transcribe segments concurrently; soft-mux each one as soon as its SRT is
+                        # ready, or hand it to the burn pool once a batch worth of SRTs is done
+                        self._set_status(f"TikTok: subtitles 0/{total}")
+                        # One CTranslate2 worker per thread, or the shared model serializes the transcribes
+                        model = load_whisper_model(job.model, num_workers=jobs)
+                        with ThreadPoolExecutor(max_workers=jobs) as ex, ThreadPoolExecutor(max_workers=workers) as burn_ex:
+                            burn_futures = {}
+                            ready = []
+
+                            def submit_burn(batch):
+                                fut = burn_ex.submit(
+                                    convert_to_9x16_ffmpeg_multi,
+                                    batch,
+                                    w,
+                                    h,
+                                    rgb,
+                                    encoder=encoder,
+                                    crf=job.crf,
+                                    force_style=force_style,
+                                    bg_mode=bg_mode,
+                                    blur_sigma=blur_sigma,
+                                    jobs=workers,
                                 )
-                                subexpr = f"subtitles={_escape_subtitles_path_for_filter(srt_seg)}:force_style={force_style}"
-                                # Choose codec
-                                use_nvenc = False
-                                eng_label = self.engine_var.get()
-                                if eng_label == "FFmpeg (NVIDIA)":
-                                    use_nvenc = True
-                                elif eng_label == "FFmpeg (auto)" and self._has_nvenc():
-                                    use_nvenc = True
-                                if use_nvenc:
-                                    vcodec = ["-c:v", "h264_nvenc", "-preset", "p1", "-cq", "23"]
+                                burn_futures[fut] = len(batch)
+
+                            futures = {}
+                            for i, seg in enumerate(seg_files):
+                                srt_seg = os.path.join(tmpdir, f"seg_{i + 1:03d}.srt")
+                                fut = ex.submit(transcribe_to_srt, seg, srt_seg, model=model, language=lang)
+                                futures[fut] = i
+                            for n, fut in enumerate(as_completed(futures), start=1):
+                                srt_seg = fut.result()
+                                i = futures[fut]
+                                self._set_status(f"TikTok: subtitles {n}/{total}")
+                                if burn:
+                                    ready.append((seg_files[i], outputs[i], srt_seg))
+                                    if len(ready) == per_process:
+                                        submit_burn(ready)
+                                        ready = []
                                 else:
-                                    vcodec = ["-c:v", "libx264", "-preset", "veryfast", "-crf", str(int(self.crf_var.get()))]
-                                cmd_burn = [
-                                    ffmpeg,
-                                    "-y",
-                                    "-i",
-                                    seg,
-                                    "-vf",
-                                    subexpr,
-                                    "-movflags",
-                                    "+faststart",
-                                    *vcodec,
-                                    "-c:a",
-                                    "aac",
-                                    "-b:a",
-                                    "192k",
-                                    final_out,
-                                ]
-                                p2 = subprocess.run(
-                                    cmd_burn,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE,
-                                    text=True,
-                                    encoding="utf-8",
-                                    errors="replace",
-                                )
-                                if p2.returncode != 0:
-                                    raise RuntimeError(f"FFmpeg burn subtitles failed: {p2.stderr}")
-                            else:
-                                mux_soft_subtitles(seg, srt_seg, final_out, language=lang)
-                            outputs.append(final_out)
-
-                            if self.tt_autopost.get():
+                                    mux_soft_subtitles(seg_files[i], srt_seg, outputs[i], language=lang)
+                            if ready:
+                                submit_burn(ready)
+
+                            done_count = 0
+                            for fut in as_completed(burn_futures):
+                                fut.result()
+                                done_count += burn_futures[fut]
+                                self._set_status(f"TikTok: burn {done_count}/{total}")
+
+                        if job.autopost:
+                            for i, final_out in enumerate(outputs, start=1):
                                 try:
-                                    self.after(0, lambda i=i: self.status_text.set(f"TikTok: uploading {i}/{total}"))
-                                    ck = (self.tt_client_key.get() or "").strip()
-                                    if not ck:
+                                    self._set_status(f"TikTok: uploading {i}/{total}")
+                                    if not job.client_key:
                                         raise RuntimeError("Missing TikTok client key")
-                                    upload_video(ck, final_out, caption=os.path.basename(final_out))
+                                    upload_video(job.client_key, final_out, caption=os.path.basename(final_out))
                                 except Exception as e:
                                     # Continue queue but notify
                                     messagebox.showwarning("TikTok", f"Upload failed for segment {i}: {e}")
@@ -660,6 +753,9 @@ class App(tk.Tk):
                 err = e
             finally:
                 def done():
+                    # Drop any throttled progress text so it can't replace the final status
+                    with self._status_lock:
+                        self._pending_status = None
                     self._set_busy(False)
                     if ok:
                         self.status_text.set("Done ✔")
@@ -674,15 +770,23 @@ class App(tk.Tk):
 
         threading.Thread(target=worker, daemon=True).start()
 
+    def _subtitle_force_style(self) -> str:
+        return build_subtitle_force_style(
+            font_name=self.subs_font_var.get().strip() or "Arial",
+            font_size=int(self.subs_size_var.get()),
+            primary_hex=self.subs_color_hex.get().strip() or "#FFFFFF",
+            outline_hex=self.subs_outline_hex.get().strip() or "#000000",
+            border_style=3 if self.subs_box_bg_var.get() else 1,
+            outline=int(self.subs_outline_var.get()),
+            shadow=int(self.subs_shadow_var.get()),
+            alignment=self.subs_align_var.get(),
+            margin_v=int(self.subs_margin_var.get()),
+        )
+
     # --- Fastest auto mode ---
     def _has_nvenc(self) -> bool:
-        try:
-            ffmpeg = iio_ffmpeg.get_ffmpeg_exe()
-            proc = subprocess.run([ffmpeg, "-hide_banner", "-h", "encoder=h264_nvenc"],
-                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            return proc.returncode == 0
-        except Exception:
-            return False
+        # Shares the converter's cached probe
+        return _probe_nvenc(_ffmpeg_exe())
 
     def fastest_convert(self):
         # Validate input first
@@ -695,22 +799,22 @@ class App(tk.Tk):
             root, _ = os.path.splitext(src)
             self.output_path.set(root + "_9x16.mp4")
 
-        # Pick fastest settings
+        # Pick fastest settings; passed straight to the job instead of through the Tk vars
         if self._has_nvenc():
             # GPU path: usually fastest without chunking
-            self.engine_var.set("FFmpeg (NVIDIA)")
-            self.parallel_var.set(False)
+            overrides = {"engine_label": "FFmpeg (NVIDIA)", "parallel": False}
         else:
             # CPU path: enable chunking with moderate CRF and jobs
-            self.engine_var.set("FFmpeg (CPU)")
-            self.crf_var.set(23)
-            self.parallel_var.set(True)
-            self.seg_var.set(30)
-            jobs = min(4, max(2, (os.cpu_count() or 2) // 2))
-            self.jobs_var.set(jobs)
+            overrides = {
+                "engine_label": "FFmpeg (CPU)",
+                "crf": 23,
+                "parallel": True,
+                "seg_sec": 30,
+                "jobs": min(4, max(2, (os.cpu_count() or 2) // 2)),
+            }
 
         # Start conversion with these settings
-        self.start_convert()
+        self.start_convert(overrides)
 
 
 def main():
@@ -9,21 +9,40 @@ Usage:
   python convert_to_9x16.py input.mp4 -o output.mp4 --width 1080 --height 1920 --bg "#101010"
 """
 import argparse
+import collections
+import functools
+import logging
 import os
+from pathlib import Path
 from typing import Tuple, Optional
 
-from moviepy.editor import VideoFileClip, ColorClip, CompositeVideoClip
 import subprocess
 import shlex
 import re
-import math
 import tempfile
 import shutil
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
 
 import imageio_ffmpeg as iio_ffmpeg
 
+logger = logging.getLogger(__name__)
 
+# Resolved once; the bundled binary may still be missing at import time, so retry on first use
+try:
+    FFMPEG_EXE = iio_ffmpeg.get_ffmpeg_exe()
+except Exception:
+    FFMPEG_EXE = None
+
+
+def _ffmpeg_exe() -> str:
+    global FFMPEG_EXE
+    if FFMPEG_EXE is None:
+        FFMPEG_EXE = iio_ffmpeg.get_ffmpeg_exe()
+    return FFMPEG_EXE
+
+
+@functools.lru_cache(maxsize=32)
 def parse_color(color: str) -> Tuple[int, int, int]:
     color = color.strip()
     if color.startswith("#") and len(color) == 7:
@@ -45,8 +64,9 @@ def _rgb_to_ffmpeg_hex(rgb: Tuple[int, int, int]) -> str:
     return f"0x{r:02x}{g:02x}{b:02x}"
 
 
+@functools.lru_cache(maxsize=4)
 def _has_nvenc(ffmpeg_exe: str) -> bool:
-    """Quick check if NVIDIA NVENC encoder is available."""
+    """Quick check if NVIDIA NVENC encoder is available (probed once per ffmpeg binary)."""
     try:
         proc = subprocess.run(
             [ffmpeg_exe, "-hide_banner", "-h", "encoder=h264_nvenc"],
@@ -58,6 +78,36 @@ def _has_nvenc(ffmpeg_exe: str) -> bool:
         return False
 
 
+# ffmpeg binary -> stderr tail of its failed CUDA-filter encode; those binaries go straight to CPU filters
+_CUDA_FAILED: dict[str, str] = {}
+
+
+@functools.lru_cache(maxsize=4)
+def _has_cuda_filters(ffmpeg_exe: str) -> bool:
+    """Whether this ffmpeg build has the CUDA scale/upload filters."""
+    try:
+        proc = _run_ffmpeg([ffmpeg_exe, "-hide_banner", "-filters"])
+    except Exception:
+        return False
+    return " scale_cuda " in proc.stdout and " hwupload_cuda " in proc.stdout
+
+
+def _nvenc_args(fastest: bool = True) -> list[str]:
+    """h264_nvenc options. fastest: low-latency tuning, no B-frames, lookahead or AQ."""
+    if not fastest:
+        return ["-c:v", "h264_nvenc", "-preset", "p1", "-tune", "hq", "-rc", "vbr", "-cq", "23"]
+    return [
+        "-c:v", "h264_nvenc", "-preset", "p1", "-tune", "ll", "-rc", "vbr", "-cq", "23",
+        "-bf", "0", "-rc-lookahead", "0", "-spatial-aq", "0", "-temporal-aq", "0",
+    ]
+
+
+def _thread_args(jobs: int = 1) -> list[str]:
+    """Decoder/filter thread options for one of `jobs` concurrent ffmpeg processes (max 16 each)."""
+    n = max(1, min(16, (os.cpu_count() or 4) // max(1, jobs)))
+    return ["-threads", "0", "-filter_threads", str(n), "-filter_complex_threads", str(n)]
+
+
 def _run_ffmpeg(cmd):
     """Run a subprocess command and decode output as UTF-8 safely."""
     return subprocess.run(
@@ -70,43 +120,135 @@ def _run_ffmpeg(cmd):
     )
 
 
+def _run_ffmpeg_tail(cmd, tail_bytes: int = 4096):
+    """
+    Run an encode, draining stderr on a background thread and keeping only its last
+    tail_bytes for error messages. Returns a CompletedProcess with that tail as stderr.
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, bufsize=1 << 16)
+    tail = collections.deque(maxlen=2)
+
+    def drain():
+        for chunk in iter(lambda: proc.stderr.read(tail_bytes), b""):
+            tail.append(chunk)
+
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+    proc.wait()
+    reader.join()
+    proc.stderr.close()
+    err = b"".join(tail)[-tail_bytes:].decode("utf-8", errors="replace")
+    return subprocess.CompletedProcess(cmd, proc.returncode, None, err)
+
+
+def _spawn_ffmpeg(cmd, log_fh):
+    """Start ffmpeg without waiting; stdout is discarded, stderr goes to log_fh."""
+    return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=log_fh)
+
+
+@functools.lru_cache(maxsize=4)
+def _ffprobe_exe(ffmpeg_exe: str) -> Optional[str]:
+    """ffprobe next to the given ffmpeg binary, else on PATH (imageio-ffmpeg ships none)."""
+    folder, name = os.path.split(ffmpeg_exe)
+    sibling = os.path.join(folder, name.replace("ffmpeg", "ffprobe", 1))
+    if sibling != ffmpeg_exe and os.path.isfile(sibling):
+        return sibling
+    return shutil.which("ffprobe")
+
+
+# (path, mtime, size) -> duration in seconds
+_DURATION_CACHE: dict[tuple[str, float, int], float] = {}
+
+
 def _probe_duration_seconds(input_path: str) -> float:
-    """Probe duration using ffmpeg stderr parsing (works without ffprobe)."""
-    ffmpeg = iio_ffmpeg.get_ffmpeg_exe()
-    proc = subprocess.run(
-        [ffmpeg, "-hide_banner", "-i", input_path],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        encoding="utf-8",
-        errors="ignore",
-    )
-    m = re.search(r"Duration:\s*(\d+):(\d+):(\d+\.?\d*)", proc.stderr or "")
-    if not m:
-        raise RuntimeError("Could not determine input duration")
-    hh, mm, ss = int(m.group(1)), int(m.group(2)), float(m.group(3))
-    return hh * 3600 + mm * 60 + ss
+    """Probe duration with ffprobe, or ffmpeg stderr parsing when ffprobe is missing."""
+    st = os.stat(input_path)
+    key = (os.path.abspath(input_path), st.st_mtime, st.st_size)
+    if key in _DURATION_CACHE:
+        return _DURATION_CACHE[key]
+
+    ffmpeg = _ffmpeg_exe()
+    dur = None
+    ffprobe = _ffprobe_exe(ffmpeg)
+    if ffprobe:
+        proc = subprocess.run(
+            [ffprobe, "-v", "error", "-show_entries", "format=duration", "-of", "default=nw=1:nk=1", input_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="ignore",
+        )
+        try:
+            dur = float(proc.stdout.strip())
+        except ValueError:
+            dur = None
+    if dur is None:
+        proc = subprocess.run(
+            [ffmpeg, "-hide_banner", "-i", input_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="ignore",
+        )
+        m = re.search(r"Duration:\s*(\d+):(\d+):(\d+\.?\d*)", proc.stderr or "")
+        if not m:
+            raise RuntimeError("Could not determine input duration")
+        hh, mm, ss = int(m.group(1)), int(m.group(2)), float(m.group(3))
+        dur = hh * 3600 + mm * 60 + ss
+    _DURATION_CACHE[key] = dur
+    return dur
+
+
+def _probe_frame_rate(input_path: str) -> Optional[float]:
+    """Frame rate of the first video stream, or None if it cannot be determined."""
+    ffmpeg = _ffmpeg_exe()
+    ffprobe = _ffprobe_exe(ffmpeg)
+    if ffprobe:
+        proc = _run_ffmpeg(
+            [ffprobe, "-v", "error", "-select_streams", "v:0", "-show_entries", "stream=r_frame_rate",
+             "-of", "default=nw=1:nk=1", input_path]
+        )
+        num, _, den = proc.stdout.strip().partition("/")
+        try:
+            rate = float(num) / float(den or 1)
+            if rate > 0:
+                return rate
+        except (ValueError, ZeroDivisionError):
+            pass
+    proc = _run_ffmpeg([ffmpeg, "-hide_banner", "-i", input_path])
+    m = re.search(r"Video:.*?(\d+(?:\.\d+)?) (?:fps|tbr)", proc.stderr or "")
+    return float(m.group(1)) if m else None
 
 
 def _srt_timestamp(seconds: float) -> str:
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = int(seconds % 60)
-    ms = int(round((seconds - int(seconds)) * 1000))
+    ms = int(seconds * 1000 + 0.5)
+    s, ms = divmod(ms, 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
     return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
 
 
-def transcribe_to_srt(
-    input_path: str,
-    srt_output: str,
+# (model_size, device, compute_type) -> (WhisperModel, num_workers), shared by every caller in the process.
+# One model per key: a request for more workers replaces the entry instead of adding a copy.
+_WHISPER_CACHE: dict[tuple[str, str, str], tuple[object, int]] = {}
+_WHISPER_LOCK = threading.Lock()
+
+
+def load_whisper_model(
     model_size: str = "base",
-    language: Optional[str] = None,
     device: str = "cpu",
-    compute_type: str = "int8",
-) -> str:
+    compute_type: Optional[str] = None,
+    num_workers: int = 1,
+):
     """
-    Transcribe audio from input video to SRT using faster-whisper.
-    Downloads the model on first use. Returns the SRT path.
+    Load a faster-whisper model. Downloads the model on first use.
+    Models are cached per (model_size, device, compute_type), so repeated calls are cheap.
+    compute_type defaults to float16 on CUDA (tensor-core GEMMs) and int8 on CPU.
+    num_workers: transcribe calls the model can run at once from different threads;
+    the CPU threads are split between them. A cached model with at least that many
+    workers is reused; otherwise it is reloaded with num_workers.
     """
     try:
         from faster_whisper import WhisperModel
@@ -115,35 +257,67 @@ def transcribe_to_srt(
             "faster-whisper is not installed. Run: pip install faster-whisper"
         ) from e
 
-    # Prefer CPU by default to avoid missing CUDA DLLs; if GPU requested, fallback to CPU
-    try:
-        model = WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=os.cpu_count() or 4)
-    except Exception as e:
-        # If GPU requested and failed (e.g., missing cublas64_12.dll), retry on CPU
-        if device != "cpu":
-            model = WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=os.cpu_count() or 4)
-        else:
-            raise
-
-    segments, info = model.transcribe(input_path, language=language)
-
-    lines = []
-    idx = 1
-    for seg in segments:
-        start = float(seg.start)
-        end = float(seg.end)
-        text = (seg.text or "").strip()
-        if not text:
-            continue
-        lines.append(str(idx))
-        lines.append(f"{_srt_timestamp(start)} --> {_srt_timestamp(end)}")
-        lines.append(text)
-        lines.append("")
-        idx += 1
+    if compute_type is None:
+        compute_type = "float16" if device == "cuda" else "int8"
+    num_workers = max(1, num_workers)
+    cpu_threads = max(1, (os.cpu_count() or 4) // num_workers)
+    key = (model_size, device, compute_type)
+    with _WHISPER_LOCK:
+        cached = _WHISPER_CACHE.get(key)
+        if cached is not None and cached[1] >= num_workers:
+            return cached[0]
+        # Prefer CPU by default to avoid missing CUDA DLLs; if GPU requested, fallback to CPU
+        try:
+            model = WhisperModel(
+                model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads, num_workers=num_workers
+            )
+        except Exception as e:
+            # If GPU requested and failed (e.g., missing cublas64_12.dll), retry on CPU
+            if device != "cpu":
+                # float16 has no CPU kernels; int8 is the fast CPU choice
+                cpu_type = "int8" if "float16" in compute_type else compute_type
+                model = WhisperModel(
+                    model_size, device="cpu", compute_type=cpu_type, cpu_threads=cpu_threads, num_workers=num_workers
+                )
+            else:
+                raise
+        _WHISPER_CACHE[key] = (model, num_workers)
+        return model
 
+
+def transcribe_to_srt(
+    input_path: str,
+    srt_output: str,
+    model_size: str = "base",
+    language: Optional[str] = None,
+    device: str = "cpu",
+    compute_type: Optional[str] = None,
+    model=None,
+    beam_size: int = 1,
+) -> str:
+    """
+    Transcribe audio from input video to SRT using faster-whisper.
+    Uses the given preloaded model, otherwise loads one. Returns the SRT path.
+    beam_size 1 (greedy) is roughly twice as fast as the library default of 5.
+    """
+    if model is None:
+        model = load_whisper_model(model_size, device=device, compute_type=compute_type)
+
+    segments, info = model.transcribe(input_path, language=language, beam_size=beam_size)
+
+    # Write cues as the segment generator yields them instead of building the whole transcript
     os.makedirs(os.path.dirname(srt_output) or ".", exist_ok=True)
-    with open(srt_output, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines).strip() + "\n")
+    with open(srt_output, "w", encoding="utf-8", buffering=1 << 20) as f:
+        idx = 1
+        for seg in segments:
+            text = (seg.text or "").strip()
+            if not text:
+                continue
+            sep = "\n" if idx > 1 else ""
+            f.write(f"{sep}{idx}\n{_srt_timestamp(float(seg.start))} --> {_srt_timestamp(float(seg.end))}\n{text}\n")
+            idx += 1
+        if idx == 1:
+            f.write("\n")
     return srt_output
 
 
@@ -203,6 +377,85 @@ def build_subtitle_force_style(
     return "'" + ",".join(parts) + "'"
 
 
+def srt_to_ass(srt_path: str, ass_path: str, force_style: Optional[str] = None) -> str:
+    """
+    Convert subtitles to ASS with ffmpeg, applying a force_style string (as built by
+    build_subtitle_force_style) to the styles so the file needs no further overrides.
+    """
+    proc = _run_ffmpeg([_ffmpeg_exe(), "-y", "-loglevel", "error", "-i", srt_path, ass_path])
+    if proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg subtitle conversion failed: {proc.stderr}")
+    if not force_style:
+        return ass_path
+
+    overrides = {}
+    for part in force_style.strip("'").split(","):
+        key, _, value = part.partition("=")
+        if value:
+            overrides[key.strip().lower()] = value.strip()
+    with open(ass_path, "r", encoding="utf-8") as fh:
+        lines = fh.read().splitlines()
+    fields = []
+    in_styles = False
+    for i, line in enumerate(lines):
+        if line.startswith("["):
+            in_styles = line.strip().lower() == "[v4+ styles]"
+        elif in_styles and line.startswith("Format:"):
+            fields = [f.strip().lower() for f in line[len("Format:"):].split(",")]
+        elif in_styles and line.startswith("Style:") and fields:
+            values = [v.strip() for v in line[len("Style:"):].split(",", len(fields) - 1)]
+            for j, name in enumerate(fields):
+                if name in overrides:
+                    values[j] = overrides[name]
+            lines[i] = "Style: " + ",".join(values)
+    with open(ass_path, "w", encoding="utf-8") as fh:
+        fh.write("\n".join(lines) + "\n")
+    return ass_path
+
+
+def _ass_time(text: str) -> float:
+    h, m, s = text.strip().split(":")
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+
+def _ass_timestamp(seconds: float) -> str:
+    cs = int(seconds * 100 + 0.5)
+    s, cs = divmod(cs, 100)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:d}:{m:02d}:{s:02d}.{cs:02d}"
+
+
+def shift_ass(ass_path: str, out_path: str, offset: float) -> str:
+    """
+    Write a copy of an ASS file with every event moved `offset` seconds earlier.
+    Events that end before 0 are dropped; ones straddling 0 start at 0.
+    """
+    with open(ass_path, "r", encoding="utf-8") as fh:
+        lines = fh.read().splitlines()
+    out = []
+    fields = []
+    in_events = False
+    for line in lines:
+        if line.startswith("["):
+            in_events = line.strip().lower() == "[events]"
+        elif in_events and line.startswith("Format:"):
+            fields = [f.strip().lower() for f in line[len("Format:"):].split(",")]
+        elif in_events and line.startswith("Dialogue:") and fields:
+            values = line[len("Dialogue:"):].split(",", len(fields) - 1)
+            i_start, i_end = fields.index("start"), fields.index("end")
+            end = _ass_time(values[i_end]) - offset
+            if end <= 0:
+                continue
+            values[i_start] = _ass_timestamp(max(0.0, _ass_time(values[i_start]) - offset))
+            values[i_end] = _ass_timestamp(end)
+            line = "Dialogue:" + ",".join(values)
+        out.append(line)
+    with open(out_path, "w", encoding="utf-8") as fh:
+        fh.write("\n".join(out) + "\n")
+    return out_path
+
+
 def convert_to_9x16_ffmpeg(
     input_path: str,
     output_path: str | None,
@@ -217,6 +470,8 @@ def convert_to_9x16_ffmpeg(
     force_style: Optional[str] = None,
     bg_mode: str = "color",  # 'color' | 'blur'
     blur_sigma: int = 20,
+    keyframe_interval: Optional[int] = None,
+    faststart: bool = True,
 ):
     """
     Fast path using FFmpeg directly. Preserves full frame (no crop) by scale+pad.
@@ -225,8 +480,14 @@ def convert_to_9x16_ffmpeg(
       - 'auto'   -> use NVENC if available, else CPU libx264
       - 'cpu'    -> libx264 with CRF
       - 'nvidia' -> h264_nvenc with fast preset
+
+    keyframe_interval: force a key frame every N seconds so the output can later
+    be split with stream copy exactly on N-second boundaries.
+
+    faststart: move the index to the front (an extra pass over the output). Turn it
+    off when the result is only an intermediate that gets remuxed anyway.
     """
-    ffmpeg = iio_ffmpeg.get_ffmpeg_exe()
+    ffmpeg = _ffmpeg_exe()
 
     # Build filters depending on background mode
     use_filter_complex = (bg_mode == "blur")
@@ -244,17 +505,17 @@ def convert_to_9x16_ffmpeg(
         filters.append("format=yuv420p")
         vf = ",".join(filters)
     else:
-        # Blurred video background: split once to avoid double decode, fast blur via boxblur
+        # Blurred video background: split once to avoid double decode, fast blur via gblur (threaded IIR Gaussian)
         subexpr = ""
         if subtitles_path:
             subexpr = f",subtitles={_escape_subtitles_path_for_filter(subtitles_path)}"
             if force_style:
                 subexpr += f":force_style={force_style}"
-        radius = max(1, int(blur_sigma))
+        sigma = max(1, int(blur_sigma))
         filter_complex = (
             f"[0:v]split[base][fgsrc];"
             f"[fgsrc]scale=w={width}:h={height}:force_original_aspect_ratio=decrease,setsar=1[fg];"
-            f"[base]scale=w={width}:h={height}:force_original_aspect_ratio=increase,crop={width}:{height},setsar=1,boxblur={radius}:1[bg];"
+            f"[base]scale=w={width}:h={height}:force_original_aspect_ratio=increase,crop={width}:{height},setsar=1,gblur=sigma={sigma}:steps=1[bg];"
             f"[bg][fg]overlay=(main_w-overlay_w)/2:(main_h-overlay_h)/2[v];"
             f"[v]format=yuv420p{subexpr}[vout]"
         )
@@ -273,20 +534,26 @@ def convert_to_9x16_ffmpeg(
         use_nvenc = False
 
     if use_nvenc:
-        vcodec = ["-c:v", "h264_nvenc", "-preset", "p1", "-cq", "23"]  # fastest preset
+        vcodec = _nvenc_args()
     else:
         vcodec = ["-c:v", "libx264", "-preset", "veryfast", "-crf", str(crf)]
+    if keyframe_interval:
+        vcodec += ["-force_key_frames", f"expr:gte(t,n_forced*{keyframe_interval})"]
+        if use_nvenc:
+            # NVENC otherwise codes forced frames as non-IDR I-frames, which carry no key flag
+            vcodec += ["-forced-idr", "1"]
+    movflags = ["-movflags", "+faststart"] if faststart else []
 
     if not use_filter_complex:
         cmd = [
             ffmpeg,
             "-y",
+            *_thread_args(),
             "-i",
             input_path,
             "-vf",
             vf,
-            "-movflags",
-            "+faststart",
+            *movflags,
             *vcodec,
             "-c:a",
             "aac",
@@ -298,6 +565,7 @@ def convert_to_9x16_ffmpeg(
         cmd = [
             ffmpeg,
             "-y",
+            *_thread_args(),
             "-i",
             input_path,
             "-filter_complex",
@@ -306,8 +574,7 @@ def convert_to_9x16_ffmpeg(
             "[vout]",
             "-map",
             "0:a?",
-            "-movflags",
-            "+faststart",
+            *movflags,
             *vcodec,
             "-c:a",
             "aac",
@@ -316,27 +583,149 @@ def convert_to_9x16_ffmpeg(
             output_path,
         ]
 
+    if use_nvenc and not use_filter_complex and ffmpeg not in _CUDA_FAILED and _has_cuda_filters(ffmpeg):
+        # Decode and downscale on the GPU, pad (and burn subtitles) on the small frame,
+        # then upload once for NVENC. Any failure (no CUDA device, older build) retries on CPU,
+        # and later encodes with this binary skip the CUDA attempt.
+        vf_cuda = ",".join([
+            f"scale_cuda=w={width}:h={height}:force_original_aspect_ratio=decrease:format=nv12",
+            "hwdownload",
+            "format=nv12",
+            *filters[1:-1],
+            "hwupload_cuda",
+        ])
+        i = cmd.index("-i")
+        cuda_cmd = cmd[:i] + ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"] + cmd[i:]
+        cuda_cmd[cuda_cmd.index(vf)] = vf_cuda
+        cuda_proc = _run_ffmpeg_tail(cuda_cmd)
+        if cuda_proc.returncode == 0:
+            return output_path
+        _CUDA_FAILED[ffmpeg] = cuda_proc.stderr
+        logger.warning(
+            "CUDA filter encode failed (code %s), using CPU filters from now on:\n%s",
+            cuda_proc.returncode,
+            cuda_proc.stderr,
+        )
+
     # Run ffmpeg
-    proc = subprocess.run(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
-    )
+    proc = _run_ffmpeg_tail(cmd)
     if proc.returncode != 0:
         raise RuntimeError(f"FFmpeg failed (code {proc.returncode}):\n{proc.stderr}")
     return output_path
 
 
+def _filter_graph_9x16(
+    idx: int,
+    width: int,
+    height: int,
+    bg_color: Tuple[int, int, int],
+    *,
+    subexpr: str = "",
+    bg_mode: str = "color",
+    blur_sigma: int = 20,
+) -> str:
+    """Filter graph mapping input [idx:v] onto the 9:16 canvas, labelled [v{idx}]."""
+    if bg_mode == "color":
+        color_hex = _rgb_to_ffmpeg_hex(bg_color)
+        return (
+            f"[{idx}:v]scale=w={width}:h={height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:color={color_hex}{subexpr},"
+            f"format=yuv420p[v{idx}]"
+        )
+    sigma = max(1, int(blur_sigma))
+    return (
+        f"[{idx}:v]split[base{idx}][fgsrc{idx}];"
+        f"[fgsrc{idx}]scale=w={width}:h={height}:force_original_aspect_ratio=decrease,setsar=1[fg{idx}];"
+        f"[base{idx}]scale=w={width}:h={height}:force_original_aspect_ratio=increase,crop={width}:{height},setsar=1,gblur=sigma={sigma}:steps=1[bg{idx}];"
+        f"[bg{idx}][fg{idx}]overlay=(main_w-overlay_w)/2:(main_h-overlay_h)/2,format=yuv420p{subexpr}[v{idx}]"
+    )
+
+
+def convert_to_9x16_ffmpeg_multi(
+    items: list[tuple[str, str, Optional[str]]],
+    width: int,
+    height: int,
+    bg_color: Tuple[int, int, int],
+    *,
+    encoder: str = "auto",
+    crf: int = 20,
+    audio_bitrate: str = "192k",
+    force_style: Optional[str] = None,
+    bg_mode: str = "color",
+    blur_sigma: int = 20,
+    jobs: int = 1,
+):
+    """
+    Convert several inputs in a single FFmpeg process, one output per input.
+    items: (input_path, output_path, subtitles_path or None)
+    jobs: how many of these processes run at once; the cores are split between
+    every encoder across them.
+
+    Saves a process start-up and encoder init for every input after the first.
+    Returns the list of output paths.
+    """
+    ffmpeg = _ffmpeg_exe()
+
+    use_nvenc = False
+    if encoder == "nvidia":
+        use_nvenc = True
+    elif encoder == "auto":
+        use_nvenc = _has_nvenc(ffmpeg)
+    else:
+        use_nvenc = False
+
+    if use_nvenc:
+        vcodec = _nvenc_args()
+    else:
+        # Each output is its own x264 instance; without a cap every one of them
+        # would start cpu_count threads
+        threads = max(1, (os.cpu_count() or 2) // (max(1, jobs) * len(items)))
+        vcodec = ["-c:v", "libx264", "-preset", "veryfast", "-crf", str(crf), "-threads", str(threads)]
+
+    inputs = []
+    graphs = []
+    outputs = []
+    for idx, (input_path, output_path, subtitles_path) in enumerate(items):
+        subexpr = ""
+        if subtitles_path:
+            subexpr = f",subtitles={_escape_subtitles_path_for_filter(subtitles_path)}"
+            if force_style:
+                subexpr += f":force_style={force_style}"
+        inputs += ["-i", input_path]
+        graphs.append(
+            _filter_graph_9x16(
+                idx, width, height, bg_color, subexpr=subexpr, bg_mode=bg_mode, blur_sigma=blur_sigma
+            )
+        )
+        outputs += [
+            "-map",
+            f"[v{idx}]",
+            "-map",
+            f"{idx}:a?",
+            "-movflags",
+            "+faststart",
+            *vcodec,
+            "-c:a",
+            "aac",
+            "-b:a",
+            audio_bitrate,
+            output_path,
+        ]
+
+    cmd = [ffmpeg, "-y", *_thread_args(jobs), *inputs, "-filter_complex", ";".join(graphs), *outputs]
+    proc = _run_ffmpeg_tail(cmd)
+    if proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed (code {proc.returncode}):\n{proc.stderr}")
+    return [output_path for _, output_path, _ in items]
+
+
 def mux_soft_subtitles(
     input_video: str,
     srt_path: str,
     output_path: str,
     language: Optional[str] = None,
 ):
-    ffmpeg = iio_ffmpeg.get_ffmpeg_exe()
+    ffmpeg = _ffmpeg_exe()
     cmd = [
         ffmpeg,
         "-y",
@@ -354,6 +743,8 @@ def mux_soft_subtitles(
         "0",
         "-map",
         "1:s:0",
+        "-movflags",
+        "+faststart",
     ]
     if language:
         cmd += ["-metadata:s:s:0", f"language={language}"]
@@ -364,6 +755,73 @@ def mux_soft_subtitles(
     return output_path
 
 
+def split_segments(
+    input_path: str,
+    out_dir: str,
+    segment_sec: float,
+    *,
+    video_audio_only: bool = False,
+    keyframe_aligned: bool = False,
+) -> list[str]:
+    """
+    Stream-copy the input into segment_sec pieces in out_dir. Returns the segment paths in order.
+
+    video_audio_only: keep only the first video stream and any audio, written as Matroska
+    (takes any source codec); otherwise all streams go into fragmented MP4.
+    keyframe_aligned: the input has key frames forced every segment_sec (see
+    convert_to_9x16_ffmpeg), so cut on those instead of the next natural key frame.
+    """
+    ffmpeg = _ffmpeg_exe()
+    ext = ".mkv" if video_audio_only else ".mp4"
+    maps = ["-map", "0:v:0", "-map", "0:a?"] if video_audio_only else ["-map", "0"]
+    # MP4 segments are only remuxed afterwards; fragmented output skips the moov rewrite at each cut
+    fmt_opts = [] if video_audio_only else ["-segment_format_options", "movflags=+frag_keyframe+empty_moov"]
+    delta = []
+    if keyframe_aligned:
+        # Forced key frames can land a hair before the boundary once the copy shifts timestamps;
+        # half a frame of slack is the documented companion to -force_key_frames
+        fps = _probe_frame_rate(input_path) or 30.0
+        delta = ["-segment_time_delta", f"{1 / (2 * fps):.6f}"]
+    cmd = [
+        ffmpeg,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-nostats",
+        "-y",
+        "-i",
+        input_path,
+        "-c",
+        "copy",
+        *maps,
+        "-f",
+        "segment",
+        "-segment_time",
+        str(segment_sec),
+        *delta,
+        "-reset_timestamps",
+        "1",
+        *fmt_opts,
+        os.path.join(out_dir, "seg_%03d" + ext),
+    ]
+    # Only errors are logged; stderr is decoded only if the split fails
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, bufsize=1 << 20)
+    if proc.returncode != 0:
+        err_text = proc.stderr.decode("utf-8", errors="replace")
+        raise RuntimeError(f"FFmpeg segment failed: {err_text}")
+
+    # The segment muxer numbers files contiguously from 000
+    seg_files = []
+    while True:
+        seg = os.path.join(out_dir, f"seg_{len(seg_files):03d}{ext}")
+        if not os.path.exists(seg):
+            break
+        seg_files.append(seg)
+    if not seg_files:
+        raise RuntimeError("No segments were produced")
+    return seg_files
+
+
 def convert_to_9x16_ffmpeg_parallel(
     input_path: str,
     output_path: str | None,
@@ -376,36 +834,26 @@ def convert_to_9x16_ffmpeg_parallel(
     audio_bitrate: str = "192k",
     segment_sec: int = 30,
     jobs: int = 2,
+    subtitles_path: Optional[str] = None,
+    force_style: Optional[str] = None,
     bg_mode: str = "color",
     blur_sigma: int = 20,
+    keyframe_interval: Optional[int] = None,
+    faststart: bool = True,
 ):
     """
     Split the input into time chunks, encode chunks in parallel, and concat.
     Faster on CPU-only systems; requires identical settings across chunks.
+    subtitles_path: burn these subtitles in while encoding each chunk.
+    keyframe_interval: as in convert_to_9x16_ffmpeg, counted from the start of the input.
+    faststart: as in convert_to_9x16_ffmpeg.
     """
-    ffmpeg = iio_ffmpeg.get_ffmpeg_exe()
-    dur = _probe_duration_seconds(input_path)
+    ffmpeg = _ffmpeg_exe()
     if segment_sec <= 0:
         segment_sec = 30
     if jobs <= 0:
         jobs = 2
-
-    use_filter_complex = (bg_mode == "blur")
-    if bg_mode == "color":
-        color_hex = _rgb_to_ffmpeg_hex(bg_color)
-        vf = (
-            f"scale=w={width}:h={height}:force_original_aspect_ratio=decrease,"
-            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:color={color_hex},"
-            f"format=yuv420p"
-        )
-    else:
-        radius = max(1, int(blur_sigma))
-        filter_complex_base = (
-            f"[0:v]split[base][fgsrc];"
-            f"[fgsrc]scale=w={width}:h={height}:force_original_aspect_ratio=decrease,setsar=1[fg];"
-            f"[base]scale=w={width}:h={height}:force_original_aspect_ratio=increase,crop={width}:{height},setsar=1,boxblur={radius}:1[bg];"
-            f"[bg][fg]overlay=(main_w-overlay_w)/2:(main_h-overlay_h)/2,format=yuv420p[vout]"
-        )
+    jobs = min(jobs, max(1, os.cpu_count() or 2))
 
     # Choose encoder options
     use_nvenc = False
@@ -417,91 +865,184 @@ def convert_to_9x16_ffmpeg_parallel(
         use_nvenc = False
 
     if use_nvenc:
-        vcodec = ["-c:v", "h264_nvenc", "-preset", "p1", "-cq", "23"]
-    else:
-        vcodec = ["-c:v", "libx264", "-preset", "veryfast", "-crf", str(crf)]
+        # One process keeps a single decode and CUDA/NVENC context, and consumer GPUs cap
+        # concurrent sessions anyway; the split and concat passes are skipped too
+        return convert_to_9x16_ffmpeg(
+            input_path,
+            output_path,
+            width,
+            height,
+            bg_color,
+            encoder="nvidia",
+            crf=crf,
+            audio_bitrate=audio_bitrate,
+            subtitles_path=subtitles_path,
+            force_style=force_style,
+            bg_mode=bg_mode,
+            blur_sigma=blur_sigma,
+            keyframe_interval=keyframe_interval,
+            faststart=faststart,
+        )
+
+    # Split the cores between the concurrent encoders instead of each spawning
+    # cpu_count frame threads; sliced threads keep latency and memory per encoder low
+    threads_per_job = max(1, (os.cpu_count() or 2) // jobs)
+    vcodec = [
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", str(crf),
+        "-threads", str(threads_per_job),
+        "-x264-params", f"sliced-threads=1:threads={threads_per_job}:rc-lookahead=10",
+    ]
 
     if not output_path:
         root, _ = os.path.splitext(input_path)
         output_path = f"{root}_9x16.mp4"
 
+    dur = _probe_duration_seconds(input_path)
     tmpdir = tempfile.mkdtemp(prefix="v916_")
     chunk_paths = []
 
-    # Plan chunks
-    n_chunks = int(math.ceil(dur / segment_sec))
-    times = [(i * segment_sec, min((i + 1) * segment_sec, dur) - i * segment_sec) for i in range(n_chunks)]
+    # Every chunk loads the subtitles again: convert to styled ASS once so libass
+    # reads it directly instead of re-detecting and converting the SRT per chunk
+    ass_path = None
+    if subtitles_path:
+        ass_path = srt_to_ass(subtitles_path, os.path.join(tmpdir, "subs.ass"), force_style=force_style)
+
+    # Plan chunks: copy-split the source once (cuts land on key frames) instead of
+    # having every chunk encode seek into and demux the full input
+    if dur <= segment_sec:
+        sources = [(input_path, 0.0)]
+    else:
+        list_csv = os.path.join(tmpdir, "src.csv")
+        split_cmd = [
+            ffmpeg,
+            "-y",
+            "-loglevel",
+            "error",
+            "-i",
+            input_path,
+            "-map",
+            "0:v:0",
+            "-map",
+            "0:a?",
+            "-c",
+            "copy",
+            "-f",
+            "segment",
+            "-segment_time",
+            str(segment_sec),
+            "-reset_timestamps",
+            "1",
+            "-segment_list",
+            list_csv,
+            "-segment_list_type",
+            "csv",
+            os.path.join(tmpdir, "src_%04d.mkv"),
+        ]
+        proc = _run_ffmpeg(split_cmd)
+        if proc.returncode != 0:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            raise RuntimeError(f"FFmpeg split failed: {proc.stderr}")
+        # csv rows: file name, start time, end time
+        sources = []
+        with open(list_csv, "r", encoding="utf-8") as fh:
+            for line in fh:
+                name, start, _ = line.strip().rsplit(",", 2)
+                sources.append((os.path.join(tmpdir, name), float(start)))
+
+    # Chunks are remuxed by the concat step, so only a lone chunk (which becomes the
+    # output as is) needs its index moved to the front
+    chunk_movflags = ["-movflags", "+faststart"] if faststart and len(sources) == 1 else []
 
     # Build commands
-    jobs = min(jobs, max(1, os.cpu_count() or 2))
-    futures = []
-    with ThreadPoolExecutor(max_workers=jobs) as ex:
-        for idx, (start, length) in enumerate(times):
-            chunk = os.path.join(tmpdir, f"chunk_{idx:04d}.mp4")
-            chunk_paths.append(chunk)
-            if not use_filter_complex:
-                cmd = [
-                    ffmpeg,
-                    "-y",
-                    "-ss",
-                    str(max(0, start)),
-                    "-t",
-                    str(max(0.001, length)),
-                    "-i",
-                    input_path,
-                    "-vf",
-                    vf,
-                    "-movflags",
-                    "+faststart",
-                    *vcodec,
-                    "-c:a",
-                    "aac",
-                    "-b:a",
-                    audio_bitrate,
-                    chunk,
-                ]
-            else:
-                cmd = [
-                    ffmpeg,
-                    "-y",
-                    "-ss",
-                    str(max(0, start)),
-                    "-t",
-                    str(max(0.001, length)),
-                    "-i",
-                    input_path,
-                    "-filter_complex",
-                    filter_complex_base,
-                    "-map",
-                    "[vout]",
-                    "-map",
-                    "0:a?",
-                    "-movflags",
-                    "+faststart",
-                    *vcodec,
-                    "-c:a",
-                    "aac",
-                    "-b:a",
-                    audio_bitrate,
-                    chunk,
-                ]
-            futures.append(ex.submit(_run_ffmpeg, cmd))
-
-        for f in as_completed(futures):
-            proc = f.result()
-            if proc.returncode != 0:
-                # Cleanup and raise
-                err = proc.stderr
-                try:
-                    shutil.rmtree(tmpdir, ignore_errors=True)
-                finally:
-                    raise RuntimeError(f"FFmpeg chunk failed: {err}")
+    cmds = []
+    for idx, (src_chunk, start) in enumerate(sources):
+        chunk = os.path.join(tmpdir, f"chunk_{idx:04d}.mp4")
+        chunk_paths.append(chunk)
+        chunk_vcodec = vcodec
+        if keyframe_interval:
+            # Chunk timestamps restart at 0; offset so key frames land on input-wide boundaries
+            first = (-start) % keyframe_interval
+            chunk_vcodec = vcodec + ["-force_key_frames", f"expr:gte(t,{first}+n_forced*{keyframe_interval})"]
+        subexpr = ""
+        if ass_path:
+            # Chunk timestamps restart at 0: move the events instead of the frames, since
+            # retiming frames in the graph loses the frame rate (ffmpeg falls back to 25 fps)
+            chunk_ass = ass_path
+            if start:
+                chunk_ass = shift_ass(ass_path, os.path.join(tmpdir, f"subs_{idx:04d}.ass"), start)
+            subexpr = f",ass={_escape_subtitles_path_for_filter(chunk_ass)}"
+        graph = _filter_graph_9x16(
+            0, width, height, bg_color, subexpr=subexpr, bg_mode=bg_mode, blur_sigma=blur_sigma
+        )
+        cmd = [
+            ffmpeg,
+            "-y",
+            *_thread_args(jobs),
+            "-i",
+            src_chunk,
+            "-filter_complex",
+            graph,
+            "-map",
+            "[v0]",
+            "-map",
+            "0:a?",
+            # Keep each source frame's timestamp: the copy-split chunks carry millisecond
+            # timestamps, which CFR output would round into a duplicated frame
+            "-fps_mode",
+            "passthrough",
+            *chunk_movflags,
+            *chunk_vcodec,
+            "-c:a",
+            "aac",
+            "-b:a",
+            audio_bitrate,
+            chunk,
+        ]
+        cmds.append(cmd)
+
+    # Keep up to `jobs` encoders running. stderr goes to a log file per chunk, so an
+    # encoder never stalls on a full pipe and no thread sits blocked reading one.
+    pending = list(enumerate(cmds))
+    running = []
+    failed_log = None
+    try:
+        while (pending or running) and failed_log is None:
+            while pending and len(running) < jobs:
+                idx, cmd = pending.pop(0)
+                log = open(os.path.join(tmpdir, f"chunk_{idx:04d}.log"), "wb")
+                running.append((_spawn_ffmpeg(cmd, log), log))
+            time.sleep(0.05)
+            still_running = []
+            for proc, log in running:
+                if proc.poll() is None:
+                    still_running.append((proc, log))
+                    continue
+                log.close()
+                if proc.returncode != 0 and failed_log is None:
+                    failed_log = log.name
+            running = still_running
+    finally:
+        # On failure, stop the remaining encoders before cleaning up
+        for proc, log in running:
+            proc.kill()
+            proc.wait()
+            log.close()
+
+    if failed_log:
+        with open(failed_log, "r", encoding="utf-8", errors="replace") as fh:
+            err = fh.read()[-4000:]
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        raise RuntimeError(f"FFmpeg chunk failed: {err}")
+
+    if len(chunk_paths) == 1:
+        # Nothing to join: the single chunk already is the finished file
+        shutil.move(chunk_paths[0], output_path)
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        return output_path
 
     # Concat
     list_path = os.path.join(tmpdir, "list.txt")
-    with open(list_path, "w", encoding="utf-8") as fh:
-        for p in chunk_paths:
-            fh.write(f"file '{p}'\n")
+    Path(list_path).write_text("".join(f"file '{p}'\n" for p in chunk_paths), encoding="utf-8")
 
     concat_cmd = [
         ffmpeg,
@@ -514,8 +1055,7 @@ def convert_to_9x16_ffmpeg_parallel(
         list_path,
         "-c",
         "copy",
-        "-movflags",
-        "+faststart",
+        *(["-movflags", "+faststart"] if faststart else []),
         output_path,
     ]
     proc = subprocess.run(
@@ -533,7 +1073,25 @@ def convert_to_9x16_ffmpeg_parallel(
     return output_path
 
 
-def convert_to_9x16(input_path: str, output_path: str | None, width: int, height: int, bg_color: Tuple[int, int, int]):
+def convert_to_9x16(
+    input_path: str,
+    output_path: str | None,
+    width: int,
+    height: int,
+    bg_color: Tuple[int, int, int],
+    *,
+    force_moviepy: bool = False,
+):
+    """Solid-color scale+pad on CPU via FFmpeg; force_moviepy uses the legacy MoviePy pipeline."""
+    if force_moviepy:
+        return _convert_to_9x16_moviepy(input_path, output_path, width, height, bg_color)
+    return convert_to_9x16_ffmpeg(input_path, output_path, width, height, bg_color, encoder="cpu", crf=20)
+
+
+def _convert_to_9x16_moviepy(input_path: str, output_path: str | None, width: int, height: int, bg_color: Tuple[int, int, int]):
+    # MoviePy is optional; only imported for the legacy path
+    from moviepy.editor import VideoFileClip, ColorClip, CompositeVideoClip
+
     # Load source
     clip = VideoFileClip(input_path)
 
@@ -574,6 +1132,7 @@ def convert_to_9x16(input_path: str, output_path: str | None, width: int, height
     resized.close()
     comp.close()
     bg.close()
+    return output_path
 
 
 if __name__ == "__main__":
@@ -593,6 +1152,11 @@ if __name__ == "__main__":
         default="ffmpeg",
         help="Conversion engine: 'ffmpeg' (fast, default) or 'moviepy' (fallback)",
     )
+    parser.add_argument(
+        "--force-moviepy",
+        action="store_true",
+        help="With --engine moviepy: really use MoviePy instead of FFmpeg on CPU",
+    )
     parser.add_argument(
         "--encoder",
         choices=["auto", "cpu", "nvidia"],
@@ -636,11 +1200,14 @@ if __name__ == "__main__":
                 force_style="'FontSize=24,OutlineColour=&H80000000,BorderStyle=3,Outline=1,Shadow=0'",
             )
         else:
-            # No burn (or no subs): convert first (parallel allowed), then mux soft subs if requested
+            # No burn (or no subs): convert first (parallel allowed), then mux soft subs if requested.
+            # With soft subs the encode goes to an intermediate that the mux turns into the final file.
+            final_out = args.output or os.path.splitext(args.input)[0] + "_9x16.mp4"
+            encode_out = final_out + ".nosubs.mp4" if srt_path else final_out
             if args.parallel:
                 convert_to_9x16_ffmpeg_parallel(
                     input_path=args.input,
-                    output_path=args.output,
+                    output_path=encode_out,
                     width=args.width,
                     height=args.height,
                     bg_color=color,
@@ -648,27 +1215,28 @@ if __name__ == "__main__":
                     crf=args.crf,
                     segment_sec=args.seg,
                     jobs=args.jobs,
+                    faststart=not srt_path,
                 )
             else:
                 convert_to_9x16_ffmpeg(
                     input_path=args.input,
-                    output_path=args.output,
+                    output_path=encode_out,
                     width=args.width,
                     height=args.height,
                     bg_color=color,
                     encoder=args.encoder,
                     crf=args.crf,
+                    faststart=not srt_path,
                 )
-            if args.auto_subs and srt_path:
+            if srt_path:
                 # Mux soft subs into final output (rewrite container quickly)
-                final_out = args.output or os.path.splitext(args.input)[0] + "_9x16.mp4"
-                tmp = final_out + ".tmp.mp4"
-                os.replace(final_out, tmp)
-                mux_soft_subtitles(tmp, srt_path, final_out, language=args.subs_lang)
                 try:
-                    os.remove(tmp)
-                except OSError:
-                    pass
+                    mux_soft_subtitles(encode_out, srt_path, final_out, language=args.subs_lang)
+                finally:
+                    try:
+                        os.remove(encode_out)
+                    except OSError:
+                        pass
     else:
         convert_to_9x16(
             input_path=args.input,
@@ -676,4 +1244,5 @@ if __name__ == "__main__":
             width=args.width,
             height=args.height,
             bg_color=color,
+            force_moviepy=args.force_moviepy,
         )
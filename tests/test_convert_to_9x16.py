@@ -0,0 +1,109 @@
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import convert_to_9x16 as conv
+
+
+def _make_source(path: str, seconds: int, fps: int = 30):
+    """Synthetic clip with audio, encoded with x264 defaults (B-frames, scene-cut key frames)."""
+    subprocess.run(
+        [
+            conv._ffmpeg_exe(), "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"testsrc2=size=320x180:rate={fps}",
+            "-f", "lavfi", "-i", "sine=frequency=440",
+            "-t", str(seconds),
+            "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac",
+            path,
+        ],
+        check=True,
+    )
+
+
+def _video_info(path: str) -> tuple[int, float]:
+    """(decoded frame count, stream frame rate) of the first video stream."""
+    proc = conv._run_ffmpeg([conv._ffmpeg_exe(), "-hide_banner", "-stats", "-i", path, "-map", "0:v:0", "-f", "null", "-"])
+    frames = int(re.findall(r"frame=\s*(\d+)", proc.stderr)[-1])
+    fps = float(re.search(r"Video:.*?(\d+(?:\.\d+)?) fps", proc.stderr).group(1))
+    return frames, fps
+
+
+class ParallelConvertTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="v916_test_")
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.src = os.path.join(self.tmp, "src.mp4")
+        _make_source(self.src, 20)
+        self.srt = os.path.join(self.tmp, "subs.srt")
+        with open(self.srt, "w", encoding="utf-8") as fh:
+            fh.write("1\n00:00:05,000 --> 00:00:07,000\nHELLO\n\n2\n00:00:10,000 --> 00:00:12,000\nWORLD\n")
+
+    def _convert(self, **kwargs) -> str:
+        out = os.path.join(self.tmp, "out.mp4")
+        conv.convert_to_9x16_ffmpeg_parallel(
+            self.src, out, 180, 320, (0, 0, 0), encoder="cpu", segment_sec=8, jobs=2, **kwargs
+        )
+        return out
+
+    def test_keeps_frame_count_and_rate(self):
+        frames, fps = _video_info(self._convert())
+        self.assertEqual(frames, 600)
+        self.assertAlmostEqual(fps, 30, delta=0.1)
+
+    def test_burned_subtitles_keep_frame_count_and_rate(self):
+        frames, fps = _video_info(self._convert(subtitles_path=self.srt))
+        self.assertEqual(frames, 600)
+        self.assertAlmostEqual(fps, 30, delta=0.1)
+
+
+class KeyframeSplitTest(unittest.TestCase):
+    def test_segments_cut_on_forced_key_frames(self):
+        tmp = tempfile.mkdtemp(prefix="v916_test_")
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        src = os.path.join(tmp, "src.mp4")
+        _make_source(src, 20)
+        exported = conv.convert_to_9x16_ffmpeg(
+            src, os.path.join(tmp, "out.mp4"), 180, 320, (0, 0, 0), encoder="cpu", keyframe_interval=5
+        )
+        seg_dir = os.path.join(tmp, "segs")
+        os.makedirs(seg_dir)
+        segments = conv.split_segments(exported, seg_dir, 5, keyframe_aligned=True)
+        durations = []
+        for seg in segments:
+            frames, fps = _video_info(seg)
+            durations.append(frames / fps)
+        self.assertEqual(len(durations), 4)
+        for dur in durations:
+            self.assertAlmostEqual(dur, 5.0, delta=0.01)
+
+
+class ShiftAssTest(unittest.TestCase):
+    def test_moves_and_drops_events(self):
+        tmp = tempfile.mkdtemp(prefix="v916_test_")
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        src = os.path.join(tmp, "in.ass")
+        with open(src, "w", encoding="utf-8") as fh:
+            fh.write(
+                "[Events]\n"
+                "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+                "Dialogue: 0,0:00:01.00,0:00:02.00,Default,,0,0,0,,gone\n"
+                "Dialogue: 0,0:00:07.50,0:00:09.00,Default,,0,0,0,,straddles, with comma\n"
+                "Dialogue: 0,0:01:10.00,0:01:12.25,Default,,0,0,0,,later\n"
+            )
+        out = conv.shift_ass(src, os.path.join(tmp, "out.ass"), 8.0)
+        with open(out, encoding="utf-8") as fh:
+            dialogue = [line for line in fh.read().splitlines() if line.startswith("Dialogue:")]
+        self.assertEqual(
+            dialogue,
+            [
+                "Dialogue: 0,0:00:00.00,0:00:01.00,Default,,0,0,0,,straddles, with comma",
+                "Dialogue: 0,0:01:02.00,0:01:04.25,Default,,0,0,0,,later",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
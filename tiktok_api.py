@@ -1,15 +1,37 @@
 # tiktok_api.py
 import os
+import ssl
 import json
 import time
 import base64
 import hashlib
 import secrets
 import threading
+import contextlib
 import webbrowser
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlencode, urlparse, parse_qs
 import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # optional, faster token file (de)serialization
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 TOKENS_FILE = os.path.join(os.path.expanduser("~"), ".video916_tiktok_tokens.json")
 
@@ -20,88 +42,276 @@ USERINFO_URL = "https://open.tiktokapis.com/v2/user/info/"
 UPLOAD_INIT = "https://open.tiktokapis.com/v2/post/publish/inbox/video/init/"
 PUBLISH_DIRECT = "https://open.tiktokapis.com/v2/post/publish/video/"  # requires video.publish scope
 
+# One TLS context for every host: the CA bundle is parsed once at import instead of
+# being loaded into a fresh context for each new connection
+_SSL_CONTEXT = ssl.create_default_context(cafile=DEFAULT_CA_BUNDLE_PATH)
+
+
+class _SharedContextAdapter(HTTPAdapter):
+    def __init__(self, *args, timeout: float = 30, **kwargs):
+        self.timeout = timeout  # used when a call doesn't pass its own
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        # Session.send always passes timeout=..., None when the caller gave none
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = _SSL_CONTEXT
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        # Proxied (HTTPS_PROXY) connections verify against the same bundle
+        proxy_kwargs.setdefault("ssl_context", _SSL_CONTEXT)
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    def cert_verify(self, conn, url, verify, cert):
+        if verify is True and not cert and conn.conn_kw.get("ssl_context") is _SSL_CONTEXT:
+            # Bundle is already in _SSL_CONTEXT; setting ca_certs would make urllib3 reload it
+            conn.cert_reqs = "CERT_REQUIRED"
+            return
+        super().cert_verify(conn, url, verify, cert)
+
+
+# Shared session: keeps TLS connections to the API and upload hosts alive between calls.
+# Retries cover idempotent requests (GET/PUT) hitting gateway errors; POSTs are only retried
+# when the connection could not be made.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    _SharedContextAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False),
+    ),
+)
+class _ThrottleRetry(Retry):
+    # urllib3 also honours Retry-After on 413/503 regardless of status_forcelist
+    RETRY_AFTER_STATUS_CODES = frozenset({429})
+
+
+# Token exchange/refresh POSTs: the authorization code is single-use and refresh tokens rotate,
+# so a request the server may have processed (5xx, read error) must not be replayed, or it ends
+# in invalid_grant. A 429 was rejected unprocessed, so that one is retried after Retry-After.
+# requests picks the longest matching mount.
+_SESSION.mount(
+    "https://open.tiktokapis.com/v2/oauth/",
+    _SharedContextAdapter(
+        max_retries=_ThrottleRetry(
+            total=3,
+            read=0,
+            other=0,
+            backoff_factor=0.5,
+            status_forcelist=[429],
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    ),
+)
+
 SCOPES_DEFAULT = [
     "user.info.basic",
     "video.upload",
 ]
+_DEFAULT_SCOPE_STR = " ".join(SCOPES_DEFAULT)
+# Authorize URL parameters that never change between calls
+_AUTH_FIXED_PARAMS = {"response_type": "code", "code_challenge_method": "S256"}
+
+
+# Parsed tokens file, reused while its mtime is unchanged
+_TOKEN_CACHE: dict[str, dict] = {}
+_CACHE_MTIME = 0
+
+
+def _copy_store(store: dict) -> dict:
+    # Callers modify entries in place; keep the cached copy untouched
+    return {k: dict(v) for k, v in store.items()}
 
 
 def _load_tokens():
-    if os.path.isfile(TOKENS_FILE):
-        with open(TOKENS_FILE, "r", encoding="utf-8") as fh:
-            return json.load(fh)
-    return {}
+    global _TOKEN_CACHE, _CACHE_MTIME
+    try:
+        mtime = os.stat(TOKENS_FILE).st_mtime_ns
+    except OSError:
+        return {}
+    if mtime != _CACHE_MTIME:
+        with open(TOKENS_FILE, "rb") as fh:
+            _TOKEN_CACHE = _loads(fh.read())
+        _CACHE_MTIME = mtime
+    return _copy_store(_TOKEN_CACHE)
 
 
 def _save_tokens(data):
+    global _TOKEN_CACHE, _CACHE_MTIME
+    # Write a sibling file and rename over the original, so readers never see a partial file
+    os.makedirs(os.path.dirname(TOKENS_FILE), exist_ok=True)
+    tmp = TOKENS_FILE + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(_dumps(data))
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, TOKENS_FILE)
+    _TOKEN_CACHE = _copy_store(data)
+    _CACHE_MTIME = os.stat(TOKENS_FILE).st_mtime_ns
+
+
+@contextlib.contextmanager
+def _locked():
+    """Hold an exclusive inter-process lock around a read-modify-write of the tokens file."""
     os.makedirs(os.path.dirname(TOKENS_FILE), exist_ok=True)
-    with open(TOKENS_FILE, "w", encoding="utf-8") as fh:
-        json.dump(data, fh)
+    with open(TOKENS_FILE + ".lock", "a+b") as fh:
+        if fcntl:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
 
 
 def _b64url(data: bytes) -> str:
-    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
 
 
 def _pkce_pair():
-    verifier = _b64url(secrets.token_bytes(32))
-    digest = hashlib.sha256(verifier.encode()).digest()
+    # 32 random bytes -> 43 URL-safe chars, already a valid verifier
+    verifier = secrets.token_urlsafe(32)
+    digest = hashlib.sha256(verifier.encode("ascii")).digest()
     challenge = _b64url(digest)
     return verifier, challenge
 
 
+# Chunked upload sizing: the API accepts 5-64 MB chunks, with the last chunk absorbing the remainder
+UPLOAD_CHUNK_SIZE = 10 * 1024 * 1024
+
+
+class _FileChunks:
+    """
+    Splits a file into the upload chunks announced in the init request. Files smaller
+    than one chunk go up as a single chunk; otherwise the last chunk takes the remainder.
+    """
+
+    def __init__(self, path: str, chunk_size: int = UPLOAD_CHUNK_SIZE):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.chunk_size = min(chunk_size, self.size) or 1
+        self.count = max(1, self.size // self.chunk_size)
+
+    def prefetch(self, length: int = 64 * 1024 * 1024):
+        """Ask the kernel to start reading the head of the file (POSIX only, non-blocking)."""
+        if not hasattr(os, "posix_fadvise"):
+            return
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, min(length, self.size), os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+    def parts(self):
+        """Yield (first_byte, last_byte, data) for each chunk, in order."""
+        # Buffered reads loop until `length` bytes arrive; a raw read(2) may return fewer
+        with open(self.path, "rb") as fh:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            for i in range(self.count):
+                first = i * self.chunk_size
+                length = self.chunk_size if i < self.count - 1 else self.size - first
+                data = fh.read(length)
+                if len(data) != length:
+                    raise RuntimeError(f"{self.path} ended early (changed while uploading?)")
+                yield first, first + length - 1, data
+
+
 class _CallbackHandler(BaseHTTPRequestHandler):
-    result = {"code": None, "state": None}
+    result = {"code": None, "state": None, "error": None}
+    done = threading.Event()  # set once the redirect has been received
+    # Socket timeout per connection: an idle one (browser preconnect, second tab) is
+    # dropped instead of blocking handle_request() past the overall deadline
+    timeout = 10
 
     def do_GET(self):
         parsed = urlparse(self.path)
         qs = parse_qs(parsed.query)
         code = qs.get("code", [None])[0]
         state = qs.get("state", [None])[0]
-        _CallbackHandler.result = {"code": code, "state": state}
+        # Denied/failed authorization redirects with ?error=...&error_description=... instead of a code
+        error = qs.get("error", [None])[0]
+        if error:
+            desc = qs.get("error_description", [None])[0]
+            error = f"{error}: {desc}" if desc else error
+        _CallbackHandler.result = {"code": code, "state": state, "error": error}
+        self.__class__.done.set()
         self.send_response(200)
         self.send_header("Content-Type", "text/html; charset=utf-8")
         self.end_headers()
-        self.wfile.write(b"<html><body>Authenticated. You can close this window.</body></html>")
+        if error:
+            self.wfile.write(b"<html><body>Authorization failed. You can close this window.</body></html>")
+        else:
+            self.wfile.write(b"<html><body>Authenticated. You can close this window.</body></html>")
 
     def log_message(self, format, *args):
         return
 
 
+def _warm_connection(url: str):
+    """Open a pooled TLS connection to url's host in the background; failures are ignored."""
+    def warm():
+        try:
+            _SESSION.head(url, timeout=10)
+        except requests.RequestException:
+            pass
+
+    threading.Thread(target=warm, daemon=True).start()
+
+
 def oauth_connect(client_key: str, client_secret: str | None, scopes=None, redirect_port: int = 8765) -> dict:
+    scope_str = " ".join(scopes) if scopes else _DEFAULT_SCOPE_STR
     scopes = scopes or SCOPES_DEFAULT
     redirect_uri = f"http://127.0.0.1:{redirect_port}/callback"
     verifier, challenge = _pkce_pair()
-    state = _b64url(secrets.token_bytes(16))
+    state = secrets.token_urlsafe(16)
 
     params = {
         "client_key": client_key,
-        "scope": " ".join(scopes),
-        "response_type": "code",
+        "scope": scope_str,
         "redirect_uri": redirect_uri,
         "state": state,
         "code_challenge": challenge,
-        "code_challenge_method": "S256",
+        **_AUTH_FIXED_PARAMS,
     }
     url = AUTH_BASE + "?" + urlencode(params)
 
+    _CallbackHandler.result = {"code": None, "state": None, "error": None}
+    _CallbackHandler.done = threading.Event()
     server = HTTPServer(("127.0.0.1", redirect_port), _CallbackHandler)
-
-    def run_server():
-        server.handle_request()
-
-    th = threading.Thread(target=run_server, daemon=True)
-    th.start()
     webbrowser.open(url)
-
-    timeout = time.time() + 300
-    while time.time() < timeout:
-        if _CallbackHandler.result.get("code"):
-            break
-        time.sleep(0.2)
-
-    server.server_close()
-
+    # The user takes seconds in the browser; have the token host's handshake done by then
+    _warm_connection(TOKEN_URL)
+
+    # Serve on this thread until the redirect arrives (or 5 minutes pass); each
+    # handle_request() returns after one request or when the remaining time runs out
+    deadline = time.monotonic() + 300
+    try:
+        while not _CallbackHandler.done.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            server.timeout = remaining
+            server.handle_request()
+    finally:
+        server.server_close()
+
+    if _CallbackHandler.result.get("error"):
+        raise RuntimeError(f"OAuth denied: {_CallbackHandler.result['error']}")
     code = _CallbackHandler.result.get("code")
     got_state = _CallbackHandler.result.get("state")
     if not code or got_state != state:
@@ -115,76 +325,120 @@ def oauth_connect(client_key: str, client_secret: str | None, scopes=None, redir
         "code_verifier": verifier,
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    resp = requests.post(TOKEN_URL, data=data, headers=headers, timeout=30)
+    resp = _SESSION.post(TOKEN_URL, data=data, headers=headers)
     if resp.status_code != 200:
         raise RuntimeError(f"Token exchange failed: {resp.text}")
     tok = resp.json()
     entry = {
         "client_key": client_key,
         "access_token": tok.get("access_token"),
+        "_auth_header": f"Bearer {tok.get('access_token')}",
         "refresh_token": tok.get("refresh_token"),
         "expires_in": int(tok.get("expires_in", 0)),
         "obtained_at": int(time.time()),
         "scopes": scopes,
     }
-    store = _load_tokens()
-    store[client_key] = entry
-    _save_tokens(store)
+    with _locked():
+        store = _load_tokens()
+        store[client_key] = entry
+        _save_tokens(store)
     return entry
 
 
-def _get_token(client_key: str) -> dict | None:
-    store = _load_tokens()
-    return store.get(client_key)
+# One refresh at a time per client key within this process
+_refresh_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(client_key: str) -> threading.Lock:
+    with _locks_guard:
+        lock = _refresh_locks.get(client_key)
+        if lock is None:
+            lock = _refresh_locks[client_key] = threading.Lock()
+        return lock
 
 
 def ensure_token(client_key: str) -> dict:
-    tok = _get_token(client_key)
+    store = _load_tokens()
+    seen_mtime = _CACHE_MTIME
+    tok = store.get(client_key)
     if not tok:
         raise RuntimeError("Not connected to TikTok")
     # Basic expiry check
     if tok.get("obtained_at", 0) + tok.get("expires_in", 0) - 60 <= int(time.time()):
-        data = {
-            "client_key": client_key,
-            "grant_type": "refresh_token",
-            "refresh_token": tok.get("refresh_token"),
-        }
-        resp = requests.post(TOKEN_URL, data=data, timeout=30)
-        if resp.status_code != 200:
-            raise RuntimeError(f"Refresh failed: {resp.text}")
-        nt = resp.json()
-        tok.update({
-            "access_token": nt.get("access_token"),
-            "refresh_token": nt.get("refresh_token", tok.get("refresh_token")),
-            "expires_in": int(nt.get("expires_in", tok.get("expires_in", 3600))),
-            "obtained_at": int(time.time()),
-        })
-        store = _load_tokens()
-        store[client_key] = tok
-        _save_tokens(store)
+        # Single-flight: threads queue on the key's lock, then re-check under the file lock
+        # since another thread or process may have just rotated the refresh token. The
+        # re-check is only a stat unless the file changed while we waited.
+        with _lock_for(client_key), _locked():
+            if _CACHE_MTIME != seen_mtime or os.stat(TOKENS_FILE).st_mtime_ns != seen_mtime:
+                store = _load_tokens()
+                tok = store.get(client_key)
+            if not tok:
+                raise RuntimeError("Not connected to TikTok")
+            if tok.get("obtained_at", 0) + tok.get("expires_in", 0) - 60 <= int(time.time()):
+                data = {
+                    "client_key": client_key,
+                    "grant_type": "refresh_token",
+                    "refresh_token": tok.get("refresh_token"),
+                }
+                resp = _SESSION.post(TOKEN_URL, data=data)
+                if resp.status_code != 200:
+                    raise RuntimeError(f"Refresh failed: {resp.text}")
+                nt = resp.json()
+                tok.update({
+                    "access_token": nt.get("access_token"),
+                    "_auth_header": f"Bearer {nt.get('access_token')}",
+                    "refresh_token": nt.get("refresh_token", tok.get("refresh_token")),
+                    "expires_in": int(nt.get("expires_in", tok.get("expires_in", 3600))),
+                    "obtained_at": int(time.time()),
+                })
+                store[client_key] = tok
+                _save_tokens(store)
+    if "_auth_header" not in tok:
+        # Entries saved before the header was stored alongside the token
+        tok["_auth_header"] = f"Bearer {tok['access_token']}"
     return tok
 
 
 def get_user_info(client_key: str) -> dict:
     tok = ensure_token(client_key)
-    headers = {"Authorization": f"Bearer {tok['access_token']}"}
-    resp = requests.get(USERINFO_URL, headers=headers, timeout=15)
+    headers = {"Authorization": tok["_auth_header"]}
+    resp = _SESSION.get(USERINFO_URL, headers=headers, timeout=15)
     if resp.status_code != 200:
         raise RuntimeError(f"User info failed: {resp.text}")
     return resp.json()
 
 
-def upload_video(client_key: str, video_path: str, caption: str | None = None, direct_publish: bool = False) -> dict:
+def _put_chunk(upload_url: str, first: int, last: int, total: int, data: bytes):
+    headers = {
+        "Content-Type": "video/mp4",
+        "Content-Range": f"bytes {first}-{last}/{total}",
+    }
+    # A failed chunk is re-sent on its own (the session adapter retries PUT on read errors and
+    # gateway 5xx with backoff) instead of restarting the whole file
+    put = _SESSION.put(upload_url, data=data, headers=headers, timeout=120)
+    if put.status_code not in (200, 201, 206):
+        raise RuntimeError(f"Upload PUT failed: {put.text}")
+
+
+def upload_video(client_key: str, video_path: str, caption: str | None = None, direct_publish: bool = False,
+                 progress=None) -> dict:
+    """progress, if given, is called as progress(bytes_sent, total_bytes) after each chunk."""
     tok = ensure_token(client_key)
-    headers = {"Authorization": f"Bearer {tok['access_token']}"}
+    headers = {"Authorization": tok["_auth_header"]}
 
+    body_stream = _FileChunks(video_path)
+    # Page the start of the file in while the init request is in flight
+    body_stream.prefetch()
     init_body = {
         "source_info": {
             "source": "FILE_UPLOAD",
-            "video_size": os.path.getsize(video_path),
+            "video_size": body_stream.size,
+            "chunk_size": body_stream.chunk_size,
+            "total_chunk_count": body_stream.count,
         }
     }
-    resp = requests.post(UPLOAD_INIT, headers=headers, json=init_body, timeout=30)
+    resp = _SESSION.post(UPLOAD_INIT, headers=headers, json=init_body)
     if resp.status_code != 200:
         raise RuntimeError(f"Upload init failed: {resp.text}")
     data = resp.json()
@@ -193,10 +447,10 @@ def upload_video(client_key: str, video_path: str, caption: str | None = None, d
     if not upload_url or not publish_id:
         raise RuntimeError("Upload init missing upload_url/publish_id")
 
-    with open(video_path, "rb") as fh:
-        put = requests.put(upload_url, data=fh, timeout=600)
-    if put.status_code not in (200, 201):
-        raise RuntimeError(f"Upload PUT failed: {put.text}")
+    for first, last, chunk in body_stream.parts():
+        _put_chunk(upload_url, first, last, body_stream.size, chunk)
+        if progress:
+            progress(last + 1, body_stream.size)
 
     if direct_publish:
         body = {
@@ -205,7 +459,7 @@ def upload_video(client_key: str, video_path: str, caption: str | None = None, d
                 "title": caption or "",
             }
         }
-        pub = requests.post(PUBLISH_DIRECT, headers=headers, json=body, timeout=30)
+        pub = _SESSION.post(PUBLISH_DIRECT, headers=headers, json=body)
         if pub.status_code != 200:
             raise RuntimeError(f"Direct publish failed: {pub.text}")
         return pub.json()